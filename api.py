@@ -0,0 +1,177 @@
+import asyncio
+import os
+import threading
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from game_index import game_id
+from page_cache import PageCache
+from reminders import GAME_LENGTH
+from schedule import BASE_URL, Game
+from teams import Team
+
+# Longest an API request waits on the bot's event loop
+LOOP_TIMEOUT = 10
+
+
+def game_json(game: Game) -> dict:
+    return {
+        "id": game_id(game),
+        "datetime": game["datetime"].isoformat(),
+        "opponent": game["opponent"],
+        "opponent_link": game["opponent_link"],
+        "home_or_away": game["home_or_away"],
+        "location": game["location"],
+        "game_link": game["game_link"],
+    }
+
+
+# --- iCal ---
+def _ical_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+
+def _ical_fold(line: str) -> list[str]:
+    # Content lines are limited to 75 octets, continuations start with a space
+    raw = line.encode()
+    if len(raw) <= 75:
+        return [line]
+    parts, start, limit = [], 0, 75
+    while start < len(raw):
+        end = min(start + limit, len(raw))
+        while end < len(raw) and (raw[end] & 0xC0) == 0x80:
+            end -= 1  # don't split a UTF-8 character
+        parts.append(raw[start:end].decode())
+        start, limit = end, 74
+    return [parts[0]] + [f" {p}" for p in parts[1:]]
+
+
+def to_ical(games: list[Game], team: str, now: datetime | None = None) -> str:
+    """Calendar of games with floating (rink-local) start times.
+
+    DTSTAMP is `now` in UTC, as RFC 5545 requires. A naive `now` is taken as
+    local time.
+    """
+    stamp = (now or datetime.now(timezone.utc)).astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//dusty-danglers-bot//schedule//EN",
+        f"X-WR-CALNAME:{_ical_escape(team)}",
+    ]
+    for game in games:
+        start = game["datetime"]
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:{game_id(game)}@{BASE_URL.split('//', 1)[-1]}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{start.strftime('%Y%m%dT%H%M%S')}",
+            f"DTEND:{(start + GAME_LENGTH).strftime('%Y%m%dT%H%M%S')}",
+            f"SUMMARY:{_ical_escape(f'{team} vs {game['opponent']} ({game['home_or_away']})')}",
+            f"LOCATION:{_ical_escape(game['location'])}",
+            f"URL:{game['game_link']}",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(folded for line in lines for folded in _ical_fold(line)) + "\r\n"
+
+
+# --- App ---
+def create_app(
+    loop: asyncio.AbstractEventLoop,
+    teams: dict[str, Team],
+    page_cache: PageCache,
+):
+    """Read-only API over the bot's own data.
+
+    Nothing here fetches from the league site: summaries only come out of the
+    page cache. Every read runs on the bot's event loop, so the stores are
+    never touched from two threads. Responses carry an ETag and answer
+    If-None-Match with 304. `?team=<key>` picks a team, the first one
+    otherwise.
+    """
+    from flask import Flask, Response, abort, jsonify, request
+
+    app = Flask("danglers-api")
+
+    def on_loop(fn: Callable, *args):
+        async def call():
+            return fn(*args)
+
+        return asyncio.run_coroutine_threadsafe(call(), loop).result(LOOP_TIMEOUT)
+
+    def conditional(response: Response) -> Response:
+        response.add_etag()
+        response.headers["Cache-Control"] = "public, max-age=60"
+        return response.make_conditional(request)
+
+    def requested_team() -> Team:
+        key = request.args.get("team")
+        team = teams.get(key) if key else next(iter(teams.values()))
+        if team is None:
+            abort(404)
+        return team
+
+    @app.get("/api/schedule")
+    def schedule_json():
+        upcoming_only = request.args.get("upcoming_only", "false").lower() in ("1", "true", "yes")
+        games = on_loop(
+            requested_team().schedule.filter,
+            upcoming_only,
+            request.args.get("home_or_away"),
+            request.args.get("opponent"),
+        )
+        return conditional(jsonify([game_json(g) for g in games]))
+
+    @app.get("/api/next_game")
+    def next_game_json():
+        game = on_loop(requested_team().schedule.next_game)
+        if game is None:
+            abort(404)
+        return conditional(jsonify(game_json(game)))
+
+    @app.get("/api/games/<game>/summary")
+    def summary_json(game: str):
+        page = on_loop(page_cache.get, f"{BASE_URL}/game/{game}", requested_team().name)
+        if page is None or page.summary is None:
+            abort(404)
+        return conditional(jsonify({"id": game, "final": page.final, "box_score": page.summary}))
+
+    @app.get("/api/season_stats")
+    def season_stats_json():
+        season_stats = requested_team().season_stats
+
+        def snapshot():
+            return {
+                "record": season_stats.record(),
+                "leaders": [dict(s, player=p) for p, s in season_stats.leaderboard("points", limit=25)],
+                "goalies": [dict(s, player=p) for p, s in season_stats.goalie_lines()],
+            }
+
+        return conditional(jsonify(on_loop(snapshot)))
+
+    @app.get("/calendar.ics")
+    def calendar():
+        team = requested_team()
+        games = on_loop(team.schedule.games)
+        # DTSTAMP is when the schedule file last changed, so the body (and ETag) only change with it
+        try:
+            stamp = datetime.fromtimestamp(os.path.getmtime(team.config.events_file), timezone.utc)
+        except FileNotFoundError:
+            stamp = datetime(2000, 1, 1, tzinfo=timezone.utc)
+        return conditional(Response(to_ical(games, team.name, now=stamp), mimetype="text/calendar"))
+
+    return app
+
+
+def serve(app, host: str = "0.0.0.0", port: int = 8080):
+    """Run the API on a background thread next to the bot."""
+    thread = threading.Thread(
+        target=app.run,
+        kwargs={"host": host, "port": port, "use_reloader": False, "threaded": True},
+        name="api",
+        daemon=True,
+    )
+    thread.start()
+    print(f"🌐 API on http://{host}:{port}/api/schedule")
+    return thread
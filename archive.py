@@ -0,0 +1,200 @@
+import asyncio
+import contextlib
+import fcntl
+import json
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from boxscore import TEAM_NAME, BoxScore, extract_box_score
+from fetch import Fetcher, FetchError
+from page_cache import PageCache
+
+# Every record is: magic, url length, compressed length, then the url and the
+# zlib-compressed page. Records are compressed one by one so any of them can
+# be read with a single seek.
+MAGIC = b"DDA1"
+HEADER = struct.Struct(">4sII")
+
+
+@dataclass(frozen=True)
+class ArchiveEntry:
+    offset: int
+    length: int
+
+
+class PageArchive:
+    """Append-only file of compressed game pages with an offset index.
+
+    The index lives next to the archive as JSON lines and is only ever
+    appended to. If it goes missing it's rebuilt by walking the record
+    headers. A URL archived twice resolves to its newest record, and a
+    record left half written by a crash is cut off on the next open.
+
+    Opening and appending hold an exclusive flock on the archive, so the bot
+    and the backfill CLI can share the file. Each instance picks up records
+    appended by others from the index before it appends.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self.index: dict[str, ArchiveEntry] = {}
+        # How far into the index file this instance has read
+        self._index_pos = 0
+        with self._locked():
+            if os.path.exists(self.index_path):
+                self._load_index()
+            else:
+                self._rebuild_index()
+            # Drop a record (or index line) that was half written when a writer last stopped
+            end = max((e.offset + e.length for e in self.index.values()), default=0)
+            if os.path.getsize(path) > end:
+                os.truncate(path, end)
+            if os.path.getsize(self.index_path) > self._index_pos:
+                os.truncate(self.index_path, self._index_pos)
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with open(self.path, "ab") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield f
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _load_index(self):
+        """Read index lines added since the last call."""
+        with open(self.index_path, "r") as f:
+            f.seek(self._index_pos)
+            while line := f.readline():
+                if not line.endswith("\n"):
+                    break  # torn by a crash mid-write, the record it points to is cut off too
+                self._index_pos = f.tell()
+                try:
+                    url, offset, length = json.loads(line)
+                except ValueError:
+                    continue
+                self.index[url] = ArchiveEntry(offset, length)
+
+    def refresh(self):
+        """Pick up pages archived by other instances or processes."""
+        # No lock needed, a line still being written is left for next time
+        self._load_index()
+
+    def _rebuild_index(self):
+        size = os.path.getsize(self.path)
+        with open(self.path, "rb") as f, open(self.index_path, "w") as idx:
+            while header := f.read(HEADER.size):
+                if len(header) < HEADER.size:
+                    break
+                magic, url_len, data_len = HEADER.unpack(header)
+                if magic != MAGIC:
+                    raise ValueError(f"{self.path} is corrupt at offset {f.tell() - HEADER.size}")
+                url = f.read(url_len).decode()
+                offset = f.tell()
+                if offset + data_len > size:
+                    break
+                f.seek(data_len, os.SEEK_CUR)
+                self.index[url] = ArchiveEntry(offset, data_len)
+                idx.write(json.dumps([url, offset, data_len]) + "\n")
+            self._index_pos = idx.tell()
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def append(self, url: str, html: str):
+        data = zlib.compress(html.encode(), 9)
+        url_bytes = url.encode()
+        with self._locked() as f:
+            self._load_index()
+            start = f.seek(0, os.SEEK_END)
+            f.write(HEADER.pack(MAGIC, len(url_bytes), len(data)))
+            f.write(url_bytes)
+            f.write(data)
+            f.flush()
+            entry = ArchiveEntry(start + HEADER.size + len(url_bytes), len(data))
+            # index last, so a crash never leaves it pointing past the end of the archive
+            with open(self.index_path, "a") as idx:
+                idx.write(json.dumps([url, entry.offset, entry.length]) + "\n")
+                self._index_pos = idx.tell()
+            self.index[url] = entry
+
+    def get(self, url: str) -> str | None:
+        entry = self.index.get(url)
+        if entry is None:
+            return None
+        return read_page(self.path, entry.offset, entry.length)
+
+
+def read_page(path: str, offset: int, length: int) -> str:
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return zlib.decompress(f.read(length)).decode()
+
+
+# --- Backfill ---
+async def backfill(
+    archive: PageArchive,
+    urls: list[str],
+    page_cache: PageCache,
+    fetcher: Fetcher,
+    concurrency: int = 4,
+) -> dict:
+    """Archive every URL that isn't archived yet, at most `concurrency` at a time.
+
+    Pages go through the page cache, so anything already cached isn't fetched
+    again.
+    """
+    archive.refresh()
+    todo = [url for url in urls if url not in archive]
+    limit = asyncio.Semaphore(concurrency)
+    counts = {"archived": 0, "skipped": len(urls) - len(todo), "failed": 0}
+
+    async def fetch(url):
+        async with limit:
+            try:
+                page = await page_cache.get_page(url, fetcher)
+            except FetchError as e:
+                print(f"⚠️ Could not fetch {url}: {e}")
+                counts["failed"] += 1
+                return
+            if page.status != 200:
+                counts["failed"] += 1
+                return
+            archive.append(url, page.html)
+            counts["archived"] += 1
+
+    await asyncio.gather(*(fetch(url) for url in todo))
+    return counts
+
+
+# --- Re-parse ---
+def _parse_entry(path: str, offset: int, length: int, team: str) -> dict:
+    # Runs in a worker process; BoxScore goes back as a dict to keep pickling cheap
+    return extract_box_score(read_page(path, offset, length), team).to_dict()
+
+
+def reparse(
+    archive: PageArchive, urls: list[str], workers: int | None = None, team: str = TEAM_NAME
+) -> dict[str, BoxScore]:
+    """Parse archived pages on every core, from `team`'s side. Workers read their own pages from disk."""
+    entries = [(url, archive.index[url]) for url in urls if url in archive]
+    if not entries:
+        return {}
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parsed = pool.map(
+            _parse_entry,
+            [archive.path] * len(entries),
+            [e.offset for _, e in entries],
+            [e.length for _, e in entries],
+            [team] * len(entries),
+            chunksize=max(1, len(entries) // (workers * 4)),
+        )
+        return {url: BoxScore.from_dict(box) for (url, _), box in zip(entries, parsed)}
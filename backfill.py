@@ -0,0 +1,76 @@
+"""Archive old game pages and rebuild summaries from them offline.
+
+    python backfill.py fetch      # download every past game page not archived yet
+    python backfill.py reparse    # re-parse the archive on all cores, rebuild
+                                  # cached summaries and season stats of every team
+
+Re-parsing never touches the network, so it can be re-run after every change
+to the box score parser.
+"""
+
+import argparse
+import asyncio
+import time
+
+import main
+from archive import PageArchive, backfill, reparse
+from teams import Team
+
+
+async def fetch_all(archive: PageArchive, concurrency: int):
+    urls = sorted({g["game_link"] for team in main.teams for g in team.schedule.past_games()})
+    try:
+        counts = await backfill(archive, urls, main.page_cache, main.fetcher, concurrency)
+    finally:
+        await main.fetcher.close()
+    print(f"📦 {counts['archived']} archived, {counts['skipped']} already there, {counts['failed']} failed")
+
+
+def rebuild(archive: PageArchive, team: Team, workers: int | None):
+    games = team.schedule.past_games()
+    started = time.perf_counter()
+    boxes = reparse(archive, [g["game_link"] for g in games], workers, team=team.name)
+    print(f"⏱️ Parsed {len(boxes)} {team.name} pages in {time.perf_counter() - started:.2f}s")
+
+    team.season_stats.reset()
+    finals = 0
+    for game in games:
+        url = game["game_link"]
+        box = boxes.get(url)
+        if box is None:
+            continue
+        final = main.is_final(game, box)
+        if main.page_cache.get(url) is None:
+            main.page_cache.put(url, archive.get(url))
+        main.page_cache.store_summary(url, box.to_dict(), final, team=team.name)
+        if final:
+            finals += 1
+            team.season_stats.fold(game, box)
+            if team.game_db:
+                team.game_db.record_box_score(game, box)
+    team.season_stats.save()
+    missing = len(games) - len(boxes)
+    print(f"📊 Rebuilt {len(boxes)} summaries and season stats from {finals} final games")
+    if missing:
+        print(f"⚠️ {missing} past games aren't archived yet, /season_stats will fetch them")
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("mode", choices=["fetch", "reparse"])
+    parser.add_argument("--archive", default=main.ARCHIVE_FILE)
+    parser.add_argument("--concurrency", type=int, default=4, help="parallel downloads for fetch")
+    parser.add_argument("--workers", type=int, help="parse processes for reparse (default: all cores)")
+    args = parser.parse_args(argv)
+
+    archive = main.archive if args.archive == main.ARCHIVE_FILE else PageArchive(args.archive)
+    if args.mode == "fetch":
+        asyncio.run(fetch_all(archive, args.concurrency))
+    else:
+        for team in main.teams:
+            rebuild(archive, team, args.workers)
+    main.workers.shutdown()
+
+
+if __name__ == "__main__":
+    main_cli()
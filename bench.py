@@ -0,0 +1,232 @@
+"""Offline benchmarks for the bot's hot paths.
+
+Runs entirely without network access: game pages come from fixtures/ and
+schedules are synthetic events.json files. Results are written as JSON so two
+runs can be compared:
+
+    python bench.py --out before.json
+    python bench.py --out after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import gc
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import main
+from boxscore import extract_box_score
+from fetch import FetchResult
+from page_cache import PageCache
+from schedule import ScheduleStore
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+OPPONENTS = [
+    ("Bold North D2", "/team/bold-north-d2/1142"),
+    ("Frost Giants", "/team/frost-giants/1192"),
+    ("Renegades", "/team/renegades/491"),
+    ("Polars", "/team/polars/1220"),
+    ("HotDishers", "/team/hotdishers/1266"),
+    ("Ice Weasels", "/team/ice-weasels/1049"),
+]
+PLAYER_STRINGS = ["#12. S. Johnson C", "#7. M. Lee", "#30. A. J. Miller", "", "junk"]
+
+
+class StubFetcher:
+    """Serves fixture HTML for every URL instead of hitting the network."""
+
+    def __init__(self, html: str):
+        self.html = html
+
+    async def get(self, url, headers=None):
+        return FetchResult(url, 200, self.html, {})
+
+
+def write_synthetic_events(path: str, count: int, start: datetime):
+    events = []
+    for i in range(count):
+        dt = start + timedelta(days=3 * i, hours=i % 4)
+        opponent, link = OPPONENTS[i % len(OPPONENTS)]
+        events.append(
+            {
+                "date": dt.strftime("%A %b %d %Y"),
+                "time": dt.strftime("%-I:%M %p"),
+                "home_or_away": "Home" if i % 2 else "Away",
+                "location": f"Rink {i % 5}",
+                "opponent": opponent,
+                "opponent_link": link,
+                "game_link": f"/game/{30000 + i}",
+            }
+        )
+    with open(path, "w") as f:
+        json.dump(events, f)
+
+
+def measure(name: str, fn, repeat: int, number: int = 1, **params) -> dict:
+    """Time fn() `number` times per sample, `repeat` samples, plus peak memory."""
+    fn()  # warm up
+    samples = []
+    gc.collect()
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {
+        "name": name,
+        "params": params,
+        "repeat": repeat,
+        "number": number,
+        "min_s": min(samples),
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "peak_kb": round(peak / 1024, 1),
+    }
+    print(f"{name:40} {json.dumps(params):28} {result['median_s'] * 1e6:12.1f} µs  {result['peak_kb']:10.1f} KB")
+    return result
+
+
+def bench_schedule(sizes: list[int], repeat: int, tmp: str) -> list[dict]:
+    team = main.default_team
+    results = []
+    start = datetime.now() - timedelta(days=365)
+    for n in sizes:
+        path = os.path.join(tmp, f"events_{n}.json")
+        write_synthetic_events(path, n, start)
+
+        def cold_load():
+            team.schedule = ScheduleStore(path)
+            main.load_games(team)
+
+        results.append(measure("load_games (cold)", cold_load, repeat, games=n))
+        team.schedule = ScheduleStore(path)
+        results.append(measure("load_games (cached)", lambda: main.load_games(team), repeat, 100, games=n))
+        results.append(measure("get_next_game", lambda: main.get_next_game(team), repeat, 1000, games=n))
+    return results
+
+
+def bench_parsing(repeat: int) -> list[dict]:
+    team = main.default_team
+    results = [
+        measure(
+            "parse_player_string",
+            lambda: [main.parse_player_string(s) for s in PLAYER_STRINGS],
+            repeat,
+            1000,
+            strings=len(PLAYER_STRINGS),
+        )
+    ]
+    game = {
+        "opponent": "Polars",
+        "datetime": datetime.now() - timedelta(days=2),
+        "game_link": "https://ahahockey.com/game/27009",
+    }
+    loop = asyncio.new_event_loop()
+    try:
+        for path in sorted(glob.glob(os.path.join(FIXTURES, "game_*.html"))):
+            fixture = os.path.basename(path)
+            with open(path) as f:
+                html = f.read()
+            main.fetcher = StubFetcher(html)
+            box = extract_box_score(html)
+            results.append(measure("extract_box_score", lambda: extract_box_score(html), repeat, 20, fixture=fixture))
+
+            def cold_summary():
+                main.page_cache = PageCache(":memory:")
+                loop.run_until_complete(main.parse_dusty_danglers_summary(team, game))
+
+            results.append(measure("parse_dusty_danglers_summary (cold)", cold_summary, repeat, 20, fixture=fixture))
+            main.page_cache = PageCache(":memory:")
+
+            def cached_summary():
+                loop.run_until_complete(main.parse_dusty_danglers_summary(team, game))
+
+            results.append(measure("parse_dusty_danglers_summary (cached)", cached_summary, repeat, 100, fixture=fixture))
+            results.append(measure("format_summary", lambda: main.format_summary(game, box, team.config), repeat, 100, fixture=fixture))
+    finally:
+        loop.close()
+    return results
+
+
+def bench_renderers(repeat: int, tmp: str) -> list[dict]:
+    team = main.default_team
+    path = os.path.join(tmp, "events_render.json")
+    write_synthetic_events(path, 20, datetime.now())
+    team.schedule = ScheduleStore(path)
+    event = main.load_games(team)[0]
+    return [
+        measure("format_rsvp_message", lambda: main.format_rsvp_message(event, team.config), repeat, 1000),
+        measure("format_game_day_message", lambda: main.format_game_day_message(event, team.config), repeat, 1000),
+    ]
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: list[dict], baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = {
+            (r["name"], json.dumps(r["params"], sort_keys=True)): r
+            for r in json.load(f)["results"]
+        }
+    print(f"\nvs {baseline_path}:")
+    for r in results:
+        old = baseline.get((r["name"], json.dumps(r["params"], sort_keys=True)))
+        if not old:
+            continue
+        ratio = r["median_s"] / old["median_s"] if old["median_s"] else float("inf")
+        flag = "  ⚠️ slower" if ratio > 1.1 else ""
+        print(f"{r['name']:40} {json.dumps(r['params']):28} {ratio:6.2f}x time  {r['peak_kb'] - old['peak_kb']:+9.1f} KB{flag}")
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="bench.json", help="where to write JSON results")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--compare", help="previous results file to diff against")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        main.page_cache = PageCache(":memory:")
+        results = bench_schedule(args.sizes, args.repeat, tmp)
+        results += bench_parsing(args.repeat)
+        results += bench_renderers(args.repeat, tmp)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📝 Wrote {len(results)} results to {args.out}")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main_cli()
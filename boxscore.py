@@ -0,0 +1,240 @@
+import functools
+import importlib.util
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+TEAM_NAME = "Dusty Danglers"
+# How long after puck drop a game with posted scores is considered final
+FINAL_AFTER = timedelta(hours=3)
+
+# lxml is a much faster tree builder; fall back to the stdlib parser if it
+# isn't installed. find_spec checks without paying for the import at startup.
+DEFAULT_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+
+@functools.cache
+def soup_tools():
+    """bs4 is slow to import, so it's only loaded the first time a page is parsed."""
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    return BeautifulSoup, SoupStrainer
+
+
+@functools.cache
+def only_tables():
+    # Only the headings and tables are needed, skip building the rest of the page
+    _, SoupStrainer = soup_tools()
+    return SoupStrainer(["h3", "table"])
+
+
+# --- Summary model ---
+@dataclass(slots=True)
+class ScoreLine:
+    team: str
+    periods: list[str]
+    final: str
+
+
+@dataclass(slots=True)
+class GoalLine:
+    scorer: str
+    assist1: str | None
+    assist2: str | None
+    period: str
+    time: str
+
+
+@dataclass(slots=True)
+class GoalieLine:
+    player: str
+    shots_against: str
+    goals_against: str
+    save_pct: str
+
+
+@dataclass(slots=True)
+class ShotLine:
+    periods: list[str]
+    total: str
+
+
+@dataclass(slots=True)
+class BoxScore:
+    final_score: ScoreLine | None = None
+    opponent_score: ScoreLine | None = None
+    goals: list[GoalLine] = field(default_factory=list)
+    goalies: list[GoalieLine] = field(default_factory=list)
+    shots_on_goal: ShotLine | None = None
+    # e.g. "Final" or "Final/OT" when the scorebox says the game is over
+    status: str | None = None
+
+    def to_dict(self) -> dict:
+        d = {}
+        if self.final_score:
+            d["final_score"] = _asdict(self.final_score)
+        if self.opponent_score:
+            d["opponent_score"] = _asdict(self.opponent_score)
+        d["goals"] = [_asdict(g) for g in self.goals]
+        d["goalies"] = [_asdict(g) for g in self.goalies]
+        d["shots_on_goal"] = _asdict(self.shots_on_goal) if self.shots_on_goal else {}
+        if self.status:
+            d["status"] = self.status
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "BoxScore":
+        return cls(
+            final_score=ScoreLine(**d["final_score"]) if d.get("final_score") else None,
+            opponent_score=(
+                ScoreLine(**d["opponent_score"]) if d.get("opponent_score") else None
+            ),
+            goals=[GoalLine(**g) for g in d.get("goals", [])],
+            goalies=[GoalieLine(**g) for g in d.get("goalies", [])],
+            shots_on_goal=ShotLine(**d["shots_on_goal"]) if d.get("shots_on_goal") else None,
+            status=d.get("status"),
+        )
+
+
+def is_final(box: BoxScore, played_at: datetime, now: datetime) -> bool:
+    """A game is final once the scorebox says so, or once both scores are
+    posted and it ended a while ago."""
+    if box.status:
+        return True
+    return box.final_score is not None and box.opponent_score is not None and now - played_at > FINAL_AFTER
+
+
+def _asdict(obj) -> dict:
+    return {name: getattr(obj, name) for name in obj.__slots__}
+
+
+# --- Extraction ---
+def parse_player_string(player_str):
+    """Extract player name and number from a string like '#12. J. Doe'.
+    Returns a tuple of (name, number) or (None, None) if parsing fails.
+    Also removes capital C from the end of the name if it exists.
+    """
+    if not player_str:
+        return None, None
+    parts = player_str.split()
+    if len(parts) < 2:
+        return None, None
+    number = parts[0].lstrip("#")
+    if number.endswith("."):
+        number = number[:-1].strip()
+    name = " ".join(parts[1:])
+    if name.endswith("C"):
+        name = name[:-1].strip()
+    return name, number
+
+
+def _texts(tds) -> list[str]:
+    return [td.get_text(strip=True) for td in tds]
+
+
+def _has_team_logo(row, team: str) -> bool:
+    return any(img.get("alt") == team for img in row.find_all("img"))
+
+
+def _body_rows(table):
+    for tbody in table.find_all("tbody"):
+        yield from tbody.find_all("tr")
+
+
+def _parse_scorebox(table, team: str, box: BoxScore):
+    for el in table.find_all(["caption", "th"]):
+        text = el.get_text(strip=True)
+        if text.lower().startswith("final"):
+            box.status = text
+            break
+    for row in table.find_all("tr"):
+        team_name = row.find("a")
+        if not team_name:
+            continue
+        cells = _texts(row.find_all("td"))
+        if team in team_name.text:
+            box.final_score = ScoreLine(team, cells[1:-1], cells[-1])
+        else:
+            box.opponent_score = ScoreLine(team_name.text.strip(), cells[1:-1], cells[-1])
+
+
+def _player(text: str) -> str | None:
+    name, number = parse_player_string(text)
+    return f"#{number} {name}" if name else None
+
+
+def _parse_goals(table, team: str, box: BoxScore):
+    for row in _body_rows(table):
+        tds = row.find_all("td")
+        if not (
+            any(td.string and team in td.string for td in tds)
+            or _has_team_logo(row, team)
+        ):
+            continue
+        cells = _texts(tds)
+        scorer_name, scorer_number = parse_player_string(cells[0])
+        box.goals.append(
+            GoalLine(
+                scorer=f"#{scorer_number} {scorer_name}",
+                assist1=_player(cells[2]),
+                assist2=_player(cells[3]),
+                period=cells[5],
+                time=cells[6],
+            )
+        )
+
+
+def _parse_goalies(table, team: str, box: BoxScore):
+    for row in _body_rows(table):
+        if not _has_team_logo(row, team):
+            continue
+        cells = _texts(row.find_all("td"))
+        goalie_name, goalie_number = parse_player_string(cells[0])
+        box.goalies.append(
+            GoalieLine(
+                player=f"#{goalie_number} {goalie_name}",
+                shots_against=cells[2],
+                goals_against=cells[3],
+                save_pct=cells[4],
+            )
+        )
+
+
+def _parse_shots(table, team: str, box: BoxScore):
+    for row in table.find_all("tr"):
+        if _has_team_logo(row, team):
+            cells = _texts(row.find_all("td"))
+            box.shots_on_goal = ShotLine(cells[1:-1], cells[-1])
+            return
+
+
+def extract_box_score(html: str, team: str = TEAM_NAME, parser: str | None = None) -> BoxScore:
+    """Parse the scorebox, goals, goalies and shots from a game page in one pass.
+
+    Only <h3> headings and <table>s are built into the tree, and they're
+    walked in document order, nested tables included. Goals and goalies
+    tables are the ones right after their heading, shots is the first table
+    anywhere after its heading.
+    """
+    BeautifulSoup, _ = soup_tools()
+    soup = BeautifulSoup(html, parser or DEFAULT_PARSER, parse_only=only_tables())
+    box = BoxScore()
+    scorebox_seen = False
+    shots_pending = False
+    for el in soup.find_all(["h3", "table"]):
+        if el.name == "h3":
+            shots_pending = shots_pending or el.get_text().strip() == "Shots on Goal"
+            continue
+        if "scorebox" in el.get("class", []) and not scorebox_seen:
+            scorebox_seen = True
+            _parse_scorebox(el, team, box)
+        if shots_pending:
+            shots_pending = False
+            _parse_shots(el, team, box)
+        previous = el.find_previous_sibling()
+        if previous is not None and previous.name == "h3":
+            heading = previous.get_text()
+            if "Goalies" in heading:
+                _parse_goalies(el, team, box)
+            elif "Goals" in heading:
+                _parse_goals(el, team, box)
+    return box
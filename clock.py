@@ -0,0 +1,71 @@
+import asyncio
+import selectors
+import time
+from datetime import datetime, timedelta
+
+
+class Clock:
+    """Where the bot reads the time from.
+
+    Anything that schedules or timestamps takes a Clock instead of calling
+    datetime.now() so replay can swap in simulated time. Sleeping stays plain
+    asyncio.sleep, which follows the event loop's clock.
+    """
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+
+SYSTEM_CLOCK = Clock()
+
+
+class LoopClock(Clock):
+    """Time taken from the running event loop, starting at `start`.
+
+    Under a VirtualTimeLoop this is simulated time.
+    """
+
+    def __init__(self, start: datetime, loop: asyncio.AbstractEventLoop | None = None):
+        self.loop = loop or asyncio.get_running_loop()
+        self.start = start
+        self.origin = self.loop.time()
+
+    def now(self) -> datetime:
+        return self.start + timedelta(seconds=self.loop.time() - self.origin)
+
+    def monotonic(self) -> float:
+        return self.loop.time()
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """Event loop whose clock jumps straight to the next timer once idle.
+
+    When nothing is runnable and no socket is ready, the loop moves its
+    clock forward by however long it would have slept instead of sleeping.
+    Loopback sockets served from this same loop are ready as soon as they're
+    written, so a stub HTTP server works. Work on other threads doesn't, and
+    time would skip ahead while it runs.
+    """
+
+    def __init__(self):
+        super().__init__(selectors.DefaultSelector())
+        self._virtual_time = 0.0
+        real_select = self._selector.select
+
+        def select(timeout=None):
+            events = real_select(0)
+            if events or timeout == 0:
+                return events
+            if timeout is None:
+                # nothing scheduled at all, so wait for real I/O
+                return real_select(None)
+            self._virtual_time += timeout
+            return []
+
+        self._selector.select = select
+
+    def time(self) -> float:
+        return self._virtual_time
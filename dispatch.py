@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import random
+import statistics
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import aiohttp
+import discord
+
+from clock import SYSTEM_CLOCK, Clock
+from paginate import paginate_chunks
+
+
+class TokenBucket:
+    """`rate` sends per `per` seconds, refilled continuously."""
+
+    def __init__(self, rate: int, per: float, clock: Clock = SYSTEM_CLOCK):
+        self.capacity = rate
+        self.fill_rate = rate / per
+        self.tokens = float(rate)
+        self.clock = clock
+        self.updated = clock.monotonic()
+
+    def _refill(self):
+        now = self.clock.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.fill_rate
+
+    def take(self):
+        self._refill()
+        self.tokens -= 1
+
+    def pause(self, seconds: float):
+        """Empty the bucket for `seconds`, e.g. after Discord says we're rate limited."""
+        self._refill()
+        self.tokens = min(self.tokens, 0) - seconds * self.fill_rate
+
+
+@dataclass
+class Outbound:
+    content: str
+    key: str
+    suppress_embeds: bool
+    future: asyncio.Future
+    enqueued_at: float
+
+
+def make_nonce(key: str) -> str:
+    # Discord nonces are at most 25 characters
+    return hashlib.sha1(key.encode()).hexdigest()[:25]
+
+
+class Dispatcher:
+    """Single path for every automated post.
+
+    Messages for the same channel that arrive within `coalesce_window` go out
+    together, packed into as few messages as fit. Sends draw from a per-channel
+    and a global token bucket. Retries reuse the same nonce, which Discord
+    enforces, so a send that actually went through is never posted twice. If
+    one page of a batch fails, only the messages on it fail, and they go out
+    alone when they're sent again.
+    """
+
+    def __init__(
+        self,
+        get_channel: Callable[[int], discord.abc.Messageable | None],
+        coalesce_window: float = 1.5,
+        per_channel: tuple[int, float] = (5, 5.0),
+        global_limit: tuple[int, float] = (40, 1.0),
+        max_attempts: int = 5,
+        clock: Clock = SYSTEM_CLOCK,
+    ):
+        self.get_channel = get_channel
+        self.clock = clock
+        self.coalesce_window = coalesce_window
+        self.per_channel = per_channel
+        self.max_attempts = max_attempts
+        self._global = TokenBucket(*global_limit, clock=clock)
+        self._buckets: dict[int, TokenBucket] = {}
+        self._queues: dict[int, list[Outbound]] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+        # Keys of messages whose last send failed
+        self._failed: set[str] = set()
+        self.stats = {"queued": 0, "messages": 0, "coalesced": 0, "retries": 0, "failed": 0}
+        self.latencies: deque[float] = deque(maxlen=200)
+
+    async def send(self, channel_id: int, content: str, key: str | None = None, suppress_embeds: bool = True):
+        """Queue a message and wait until it has been delivered."""
+        future = asyncio.get_running_loop().create_future()
+        key = key or f"{channel_id}:{content}"
+        item = Outbound(content, key, suppress_embeds, future, self.clock.monotonic())
+        self._queues.setdefault(channel_id, []).append(item)
+        self.stats["queued"] += 1
+        if channel_id not in self._workers:
+            self._workers[channel_id] = asyncio.create_task(self._drain(channel_id))
+        await future
+
+    async def _drain(self, channel_id: int):
+        try:
+            while self._queues.get(channel_id):
+                await asyncio.sleep(self.coalesce_window)
+                batch = self._queues.pop(channel_id, [])
+                for suppress in (True, False):
+                    items = [i for i in batch if i.suppress_embeds == suppress]
+                    if items:
+                        await self._send_batch(channel_id, items, suppress)
+        finally:
+            self._workers.pop(channel_id, None)
+
+    async def _send_batch(self, channel_id: int, items: list[Outbound], suppress_embeds: bool):
+        # A message that failed before goes out on its own, so its nonce is the
+        # same as last time rather than depending on whatever it's queued with now
+        retried = [i for i in items if i.key in self._failed]
+        fresh = [i for i in items if i.key not in self._failed]
+        for item in retried:
+            await self._send_pages(channel_id, [item], suppress_embeds)
+        if fresh:
+            await self._send_pages(channel_id, fresh, suppress_embeds)
+
+    async def _send_pages(self, channel_id: int, items: list[Outbound], suppress_embeds: bool):
+        """Send items packed into pages. Each page's nonce comes from the keys
+        of the items on it, and an item only fails if one of its own pages did."""
+        pages = paginate_chunks([i.content for i in items])
+        errors: dict[int, Exception] = {}
+        parts: dict[int, int] = {}
+        sent = 0
+        for page, on_page in pages:
+            part = parts[on_page[0]] = parts.get(on_page[0], -1) + 1
+            earlier = next((errors[n] for n in on_page if n in errors), None)
+            if earlier is not None:
+                # the rest of a message whose first page already failed
+                for n in on_page:
+                    errors.setdefault(n, earlier)
+                continue
+            nonce = make_nonce("|".join(items[n].key for n in on_page) + f"#{part}")
+            try:
+                await self._deliver(channel_id, page, nonce, suppress_embeds)
+            except Exception as e:
+                for n in on_page:
+                    errors.setdefault(n, e)
+                continue
+            sent += 1
+        self.stats["coalesced"] += max(0, len(items) - len(errors) - sent)
+        now = self.clock.monotonic()
+        for n, item in enumerate(items):
+            if n in errors:
+                self.stats["failed"] += 1
+                self._failed.add(item.key)
+                if not item.future.done():
+                    item.future.set_exception(errors[n])
+                continue
+            self._failed.discard(item.key)
+            self.latencies.append(now - item.enqueued_at)
+            if not item.future.done():
+                item.future.set_result(None)
+
+    async def _wait_for_budget(self, bucket: TokenBucket):
+        while (delay := max(bucket.wait_time(), self._global.wait_time())) > 0:
+            await asyncio.sleep(delay)
+        bucket.take()
+        self._global.take()
+
+    async def _deliver(self, channel_id: int, content: str, nonce: str, suppress_embeds: bool):
+        if channel_id not in self._buckets:
+            self._buckets[channel_id] = TokenBucket(*self.per_channel, clock=self.clock)
+        bucket = self._buckets[channel_id]
+        for attempt in range(self.max_attempts):
+            await self._wait_for_budget(bucket)
+            channel = self.get_channel(channel_id)
+            if channel is None:
+                raise LookupError(f"Channel {channel_id} not found")
+            try:
+                await channel.send(content, nonce=nonce, suppress_embeds=suppress_embeds)
+                self.stats["messages"] += 1
+                return
+            except discord.RateLimited as e:
+                # the bucket now holds the next attempt back for retry_after
+                bucket.pause(e.retry_after)
+                delay = 0.0
+            except discord.HTTPException as e:
+                if e.status < 500:
+                    raise
+                delay = 2**attempt * random.uniform(0.5, 1.5)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                delay = 2**attempt * random.uniform(0.5, 1.5)
+            if attempt + 1 < self.max_attempts:
+                self.stats["retries"] += 1
+                print(f"⚠️ Send to {channel_id} failed, retrying")
+                await asyncio.sleep(delay)
+        raise RuntimeError(f"Gave up sending to {channel_id} after {self.max_attempts} attempts")
+
+    def summary(self) -> dict:
+        latencies = list(self.latencies)
+        return dict(
+            self.stats,
+            pending=sum(len(q) for q in self._queues.values()),
+            latency_median=statistics.median(latencies) if latencies else 0.0,
+            latency_max=max(latencies) if latencies else 0.0,
+        )
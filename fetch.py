@@ -0,0 +1,137 @@
+import asyncio
+import random
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from metrics import Metrics
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class FetchError(Exception):
+    """Raised when a URL could not be fetched after all retries."""
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int
+    text: str
+    headers: Mapping[str, str] = field(default_factory=dict)
+
+
+def parse_retry_after(value: str) -> float | None:
+    """Seconds to wait from a Retry-After header, given as seconds or an HTTP date."""
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class Fetcher:
+    """Async HTTP client sharing one pooled aiohttp session for the bot's lifetime.
+
+    Requests get connect/read timeouts, a bounded number of retries with
+    jittered exponential backoff, and at most `per_host` in-flight requests
+    per host. A server's Retry-After is honoured up to `max_delay` seconds,
+    so it can't hold a command or worker slot for hours.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = 5,
+        read_timeout: float = 15,
+        retries: int = 3,
+        backoff: float = 0.5,
+        per_host: int = 4,
+        pool_size: int = 20,
+        max_delay: float = 60,
+        metrics: Metrics | None = None,
+    ):
+        self.timeout = aiohttp.ClientTimeout(
+            total=None, sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self.retries = retries
+        self.backoff = backoff
+        self.per_host = per_host
+        self.pool_size = pool_size
+        self.max_delay = max_delay
+        self.metrics = metrics
+        self._session: aiohttp.ClientSession | None = None
+        self._host_limits: dict[str, asyncio.Semaphore] = {}
+
+    async def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_size, limit_per_host=self.per_host, ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={"User-Agent": "dusty-danglers-bot"},
+            )
+        return self._session
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return self._host_limits[host]
+
+    def _delay(self, attempt: int, retry_after: str | None = None) -> float:
+        wait = parse_retry_after(retry_after) if retry_after else None
+        if wait is None:
+            wait = self.backoff * (2**attempt) * random.uniform(0.5, 1.5)
+        return min(wait, self.max_delay)
+
+    async def get(self, url: str, headers: dict[str, str] | None = None) -> FetchResult:
+        """GET a URL, retrying transient failures.
+
+        Non-retryable statuses (including 304) are returned as-is; a retryable
+        status that persists past the last attempt is returned too. Only
+        connection errors and timeouts that never succeed raise FetchError.
+        """
+        session = await self.session()
+        last_error: Exception | None = None
+        for attempt in range(self.retries + 1):
+            retry_after = None
+            started = time.perf_counter()
+            try:
+                async with self._host_limit(url):
+                    async with session.get(url, headers=headers) as resp:
+                        text = await resp.text()
+                        result = FetchResult(url, resp.status, text, resp.headers.copy())
+                self._observe(url, started, str(result.status))
+                if result.status not in RETRY_STATUSES or attempt == self.retries:
+                    return result
+                retry_after = result.headers.get("Retry-After")
+                print(f"⚠️ {url} returned {result.status}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._observe(url, started, "error")
+                last_error = e
+                print(f"⚠️ Fetching {url} failed ({e!r})")
+            if attempt < self.retries:
+                await asyncio.sleep(self._delay(attempt, retry_after))
+        raise FetchError(f"Could not fetch {url}") from last_error
+
+    def _observe(self, url: str, started: float, status: str):
+        if self.metrics:
+            self.metrics.observe(
+                "fetch_seconds", time.perf_counter() - started, host=urlsplit(url).netloc, status=status
+            )
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,76 @@
+import bisect
+import re
+from datetime import datetime
+
+from schedule import Game
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Discord allows at most 25 autocomplete choices
+MAX_CHOICES = 25
+
+
+def game_id(game: Game) -> str:
+    return game["game_link"].rstrip("/").rsplit("/", 1)[-1]
+
+
+def game_label(game: Game) -> str:
+    return f"{game['datetime'].strftime('%b %d, %Y')} · vs {game['opponent']} ({game['home_or_away']})"
+
+
+def _tokens(game: Game) -> set[str]:
+    dt = game["datetime"]
+    words = f"{game['opponent']} {game['home_or_away']} {game['location']}".lower()
+    tokens = set(TOKEN_RE.findall(words))
+    tokens |= {
+        dt.strftime("%b").lower(),
+        dt.strftime("%B").lower(),
+        dt.strftime("%a").lower(),
+        dt.strftime("%A").lower(),
+        str(dt.day),
+        str(dt.year),
+        dt.strftime("%Y-%m-%d"),
+        f"{dt.month}/{dt.day}",
+    }
+    return tokens
+
+
+class GameIndex:
+    """Prefix index over every token of every game, for autocomplete.
+
+    Tokens (opponent words, month and weekday names, day, year, ISO date,
+    m/d) are kept in one sorted list, so each query word is a bisect plus a
+    short scan. Build it once per schedule version.
+    """
+
+    def __init__(self, games: list[Game]):
+        self.games = sorted(games, key=lambda g: g["datetime"], reverse=True)
+        self.by_id = {game_id(g): g for g in self.games}
+        entries = sorted((token, i) for i, g in enumerate(self.games) for token in _tokens(g))
+        self._tokens = [t for t, _ in entries]
+        self._positions = [i for _, i in entries]
+
+    def _prefix(self, word: str) -> set[int]:
+        lo = bisect.bisect_left(self._tokens, word)
+        hi = bisect.bisect_left(self._tokens, word + "\uffff")
+        return set(self._positions[lo:hi])
+
+    def search(self, query: str, before: datetime | None = None, limit: int = MAX_CHOICES) -> list[Game]:
+        """Games matching every word of the query by prefix, newest first.
+
+        `before` leaves out games that haven't started yet.
+        """
+        matches: set[int] | None = None
+        for word in re.findall(r"[a-z0-9/-]+", query.lower()):
+            hits = self._prefix(word)
+            matches = hits if matches is None else matches & hits
+            if not matches:
+                return []
+        positions = sorted(matches) if matches is not None else range(len(self.games))
+        results = []
+        for i in positions:
+            game = self.games[i]
+            if before is None or game["datetime"] < before:
+                results.append(game)
+                if len(results) == limit:
+                    break
+        return results
@@ -0,0 +1,83 @@
+import asyncio
+import statistics
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class WorkerPool:
+    """Bounded pool for slow command work.
+
+    At most `max_jobs` jobs run at once and the rest wait their turn. CPU-heavy
+    steps (HTML parsing) go to a thread or process pool via run_cpu so they
+    never block the event loop; with cpu_workers=0 they run inline instead,
+    which replay needs to keep time deterministic. Queue depth and per-job
+    wait/run times are kept for /bot_status.
+    """
+
+    def __init__(self, max_jobs: int = 4, cpu_workers: int = 2, use_processes: bool = False):
+        self.max_jobs = max_jobs
+        self._slots = asyncio.Semaphore(max_jobs)
+        self._executor: Executor | None = None
+        if use_processes:
+            self._executor = ProcessPoolExecutor(max_workers=cpu_workers)
+        elif cpu_workers:
+            self._executor = ThreadPoolExecutor(max_workers=cpu_workers, thread_name_prefix="parse")
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self._timings: dict[str, deque] = defaultdict(lambda: deque(maxlen=100))
+
+    async def submit(self, name: str, fn: Callable[..., Awaitable], *args):
+        """Run fn(*args) once a slot is free and record how long it waited and ran."""
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        started_at = time.perf_counter()
+        self.running += 1
+        try:
+            result = await fn(*args)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+            self._slots.release()
+            done_at = time.perf_counter()
+            self._timings[name].append((started_at - queued_at, done_at - started_at))
+        self.completed += 1
+        return result
+
+    async def run_cpu(self, fn: Callable, *args):
+        """Run a blocking function on the executor."""
+        if self._executor is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def stats(self) -> dict:
+        jobs = {}
+        for name, timings in self._timings.items():
+            waits = [w for w, _ in timings]
+            runs = [r for _, r in timings]
+            jobs[name] = {
+                "count": len(timings),
+                "wait_median": statistics.median(waits),
+                "run_median": statistics.median(runs),
+                "run_max": max(runs),
+            }
+        return {
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "jobs": jobs,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
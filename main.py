@@ -1,74 +1,175 @@
 import discord
 from discord.ext import commands
-from datetime import datetime, timedelta, time as dtime
-import json
+from datetime import datetime, timedelta
+from typing import Literal
 import os
 import asyncio
+import functools
+import hashlib
+import json
+import time
 
 from dotenv import load_dotenv
 import random
-from typing import TypedDict
-import requests
-from bs4 import BeautifulSoup
+
+from api import create_app, serve as serve_api
+from archive import PageArchive, backfill
+from boxscore import TEAM_NAME, BoxScore, extract_box_score, is_final as box_is_final, parse_player_string
+from clock import SYSTEM_CLOCK
+from dispatch import Dispatcher
+from fetch import Fetcher, FetchError
+from game_index import GameIndex, game_id, game_label
+from jobs import WorkerPool
+from metrics import Metrics, Sample, serve as serve_metrics
+from page_cache import PageCache
+from paginate import paginate
+from postgame import watch_for_final
+from reminders import POST_GAME_DEADLINE, ReminderScheduler, default_rules
+from schedule import Game
+from schedule_sync import ScheduleDiff
+from scout import Scout, ScoutReport
+from stats import SeasonStats
+from storage import SqliteGameStore
+from supervisor import Supervisor
+from teams import Team, TeamConfig, find_team, load_team_configs, open_team, shard_for, slugify
 
 load_dotenv()
 
 # --- Discord bot setup ---
 TOKEN = os.getenv("TOKEN")
-CHANNEL_ID = int(os.getenv("CHANNEL_ID"))
+# Teams the bot serves, one per server. Without the file it's the one team
+# set up by CHANNEL_ID, GUILD_ID, TEAM_LINK and the constants below.
+TEAMS_FILE = os.getenv("TEAMS_FILE", "./teams.json")
+CHANNEL_ID = int(os.getenv("CHANNEL_ID", "0"))
+GUILD_ID = os.getenv("GUILD_ID")
+# Team page the schedule is synced from, e.g. /team/dusty-danglers/1234
+TEAM_LINK = os.getenv("TEAM_LINK")
+# "json" reads events.json directly, "sqlite" keeps games and results in each team's games db
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json")
+# Run only some shards in this process, e.g. SHARD_COUNT=4 SHARD_IDS=0,1.
+# Unset, Discord's recommended shard count all runs here.
+SHARD_COUNT = os.getenv("SHARD_COUNT")
+SHARD_IDS = os.getenv("SHARD_IDS")
+# Serve Prometheus metrics on this local port if set; PROFILING=1 adds /debug/profile
+METRICS_PORT = os.getenv("METRICS_PORT")
+PROFILING = os.getenv("PROFILING") == "1"
+# Serve the read-only schedule/stats API on this port if set
+API_PORT = os.getenv("API_PORT")
+API_HOST = os.getenv("API_HOST", "0.0.0.0")
+# Add a short scouting section on the opponent to RSVP reminders
+SCOUT_IN_RSVP = os.getenv("SCOUT_IN_RSVP") == "1"
 
 intents = discord.Intents.default()
 intents.message_content = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+metrics = Metrics()
+fetcher = Fetcher(metrics=metrics)
+
+
+class DanglersBot(commands.AutoShardedBot):
+    async def setup_hook(self):
+        # Runs once per process, unlike on_ready which fires again on reconnect
+        await sync_commands_if_changed()
+        if API_PORT:
+            app = create_app(asyncio.get_running_loop(), teams_by_key, page_cache)
+            serve_api(app, host=API_HOST, port=int(API_PORT))
+
+    async def close(self):
+        await supervisor.stop()
+        await fetcher.close()
+        workers.shutdown()
+        page_cache.close()
+        for team in teams:
+            if team.game_db:
+                team.game_db.close()
+        await super().close()
+
+
+bot = DanglersBot(
+    command_prefix="!",
+    intents=intents,
+    shard_count=int(SHARD_COUNT) if SHARD_COUNT else None,
+    shard_ids=[int(i) for i in SHARD_IDS.split(",")] if SHARD_IDS else None,
+    # Longer rate limits raise discord.RateLimited, which the dispatcher waits out itself
+    max_ratelimit_timeout=30.0,
+)
 
 # --- Event storage ---
+# Files for the team set up from the environment, teams.json entries get their own
 EVENTS_FILE = "./events.json"
+PAGE_CACHE_FILE = "./page_cache.sqlite3"
+STATS_FILE = "./season_stats.json"
+SENT_LOG_FILE = "./sent_reminders.json"
+GAMES_DB_FILE = "./games.sqlite3"
+COMMAND_HASH_FILE = "./command_tree.sha1"
+ARCHIVE_FILE = "./game_pages.archive"
 
 # --- Constants ----
 EMOJI_HOME = "<:dusty_danglers_night:1250533925156290761>"
 EMOJI_AWAY = "<:dusty_danglers_day:1250533926796267530>"
-BASE_URL = "https://ahahockey.com"
 DANGLERS_ROLE = "<@&1296192458073575464>"
+JERSEY_REMINDER = "<@1126284695689232415>"
+
+default_config = TeamConfig(
+    key=slugify(TEAM_NAME),
+    name=TEAM_NAME,
+    channel_id=CHANNEL_ID,
+    guild_id=int(GUILD_ID) if GUILD_ID else None,
+    team_link=TEAM_LINK,
+    role=DANGLERS_ROLE,
+    emoji_home=EMOJI_HOME,
+    emoji_away=EMOJI_AWAY,
+    jersey_reminder=JERSEY_REMINDER,
+    events_file=EVENTS_FILE,
+    stats_file=STATS_FILE,
+    sent_log_file=SENT_LOG_FILE,
+    games_db_file=GAMES_DB_FILE,
+)
+
+# One page cache and fetcher for every team, so a game between two of them is fetched once
+page_cache = PageCache(PAGE_CACHE_FILE)
+teams = [
+    open_team(config, page_cache, fetcher, STORAGE_BACKEND)
+    for config in load_team_configs(TEAMS_FILE, default_config)
+]
+teams_by_key = {team.config.key: team for team in teams}
+# The first team, which bench.py, backfill.py and replay.py work on
+default_team = teams[0]
+dispatcher = Dispatcher(bot.get_channel)
+supervisor = Supervisor()
+# Replaced by a simulated clock in replay.py
+clock = SYSTEM_CLOCK
+workers = WorkerPool(
+    max_jobs=4, cpu_workers=2, use_processes=os.getenv("PARSE_IN_PROCESSES") == "1"
+)
+scout = Scout(page_cache, fetcher, run_cpu=workers.run_cpu)
+# One archive for every team, a game between two of them is archived once
+archive = PageArchive(ARCHIVE_FILE)
+backfill_lock = asyncio.Lock()
+
+# Post-game polls reuse a page this fresh, so when both teams in a game use
+# the bot their watchers share fetches
+POST_GAME_MAX_AGE = 30
+
+
+def load_games(team: Team) -> list[Game]:
+    with metrics.timer("stage_seconds", stage="load_games"):
+        return team.schedule.games()
+
 
+def team_for(interaction: discord.Interaction) -> Team | None:
+    return find_team(teams, interaction.guild_id, interaction.channel_id)
 
-class Game(TypedDict):
-    date: str
-    time: str
-    opponent: str
-    opponent_link: str
-    home_or_away: str
-    location: str
-    game_link: str
-    datetime: datetime
-
-
-def load_games() -> list[Game]:
-    with open(EVENTS_FILE, "r") as f:
-        games = json.load(f)
-        # parse dates
-        events = []
-        for game in games:
-            event_datetime = parse_event_datetime(game)
-            if event_datetime is None:
-                print(f"Broken date {game.get('date', '')}")
-            event = {
-                "date": event_datetime.strftime("%A, %B %d"),
-                "time": event_datetime.strftime("%-I:%M%p"),
-                "datetime": event_datetime,
-                "opponent": game.get("opponent", ""),
-                "opponent_link": f"{BASE_URL}{game.get("opponent_link", "")}",
-                "home_or_away": game.get("home_or_away", ""),
-                "location": game.get("location", ""),
-                "game_link": f"{BASE_URL}{game.get("game_link", "")}",
-                "location_link": f"https://www.google.com/maps/search/?api=1&query={game.get('location', '').replace(' ', '+')}+arena",
-            }
-            events.append(event)
-    return events
+
+async def require_team(interaction: discord.Interaction) -> Team | None:
+    team = team_for(interaction)
+    if team is None:
+        await interaction.response.send_message("This server doesn't have a team set up.")
+    return team
 
 
 # --- Helper functions ---
-def format_rsvp_message(event):
-    emoji = EMOJI_HOME if event["home_or_away"].lower() == "home" else EMOJI_AWAY
+def format_rsvp_message(event, team: TeamConfig):
+    emoji = team.emoji_home if event["home_or_away"].lower() == "home" else team.emoji_away
 
     msg = (
         f"@everyone Our next game is coming up!\n\n"
@@ -80,129 +181,84 @@ def format_rsvp_message(event):
     return msg
 
 
-def parse_event_datetime(event):
-    dt_str = f"{event['date']} {event['time']}"
-    try:
-        parsed_date = datetime.strptime(dt_str, "%A %b %d %Y %I:%M %p")
-        return parsed_date
-    except ValueError:
-        return None
-
-
 game_day_messages = [
-    lambda: "WTFU ITS GAME DAY!!!",
-    lambda: "GET IN LOSER, WE'RE GOING TO WIN OUR GAME TONIGHT!!!",
-    lambda: "WELCOME TO DAY OF GAME",
-    lambda: f"{(get_next_game()['datetime'] - datetime.now()).total_seconds():.0f} SECONDS TO GAME TIME",
-    lambda: "TIME FOR AN EZ W TNIGHT!!!",
-    lambda: "YOU HYPED? WELL YOU SHOULD BE, IT'S GAME DAY!!!",
-    lambda: "SHAKE OFF THE DUST, DANGLERS, IT'S GAME DAY!!!",
-    lambda: "I HEARD STEVE IS SCORING A HAT TRICK TONIGHT, GET HYPED!!!",
-    lambda: "I HOPE YOU LIKE HOCKEY, CUZ WE HAVE HOCKEY TN!!!",
-    lambda: "6-7?? MORE LIKE 7-6 IN OUR FAVOR TONIGHT!!!",
-    lambda: "GRAB YOUR STICKS, IT'S GAME DAY!!!",
-    lambda: "AJ'S GETTING HIS FIRST GOALIE GOAL TONIGHT, LET'S GO!!",
+    lambda event: "WTFU ITS GAME DAY!!!",
+    lambda event: "GET IN LOSER, WE'RE GOING TO WIN OUR GAME TONIGHT!!!",
+    lambda event: "WELCOME TO DAY OF GAME",
+    lambda event: f"{(event['datetime'] - clock.now()).total_seconds():.0f} SECONDS TO GAME TIME",
+    lambda event: "TIME FOR AN EZ W TNIGHT!!!",
+    lambda event: "YOU HYPED? WELL YOU SHOULD BE, IT'S GAME DAY!!!",
+    lambda event: "I HOPE YOU LIKE HOCKEY, CUZ WE HAVE HOCKEY TN!!!",
+    lambda event: "6-7?? MORE LIKE 7-6 IN OUR FAVOR TONIGHT!!!",
+    lambda event: "GRAB YOUR STICKS, IT'S GAME DAY!!!",
+]
+# Inside jokes that only make sense for the Dusty Danglers
+danglers_game_day_messages = [
+    lambda event: "SHAKE OFF THE DUST, DANGLERS, IT'S GAME DAY!!!",
+    lambda event: "I HEARD STEVE IS SCORING A HAT TRICK TONIGHT, GET HYPED!!!",
+    lambda event: "AJ'S GETTING HIS FIRST GOALIE GOAL TONIGHT, LET'S GO!!",
 ]
 
 
-def format_game_day_message(event: Game):
+def format_game_day_message(event: Game, team: TeamConfig):
     jersey_color = "light" if event["home_or_away"].lower() == "home" else "dark"
-    emoji = EMOJI_HOME if event["home_or_away"].lower() == "home" else EMOJI_AWAY
+    emoji = team.emoji_home if event["home_or_away"].lower() == "home" else team.emoji_away
+    messages = game_day_messages + (danglers_game_day_messages if team.name == TEAM_NAME else [])
 
-    return (
-        f"{DANGLERS_ROLE} {random.choice(game_day_messages)()}\n\n"
-        f"{emoji} Personal reminder for <@1126284695689232415>, bring your {jersey_color} jersey\n\n"
-        f"📍 See ya'll {event['time']} at [{event['location']}]({event['location_link']})"
-    )
+    lines = [f"{team.role} {random.choice(messages)(event)}"]
+    if team.jersey_reminder:
+        lines.append(f"{emoji} Personal reminder for {team.jersey_reminder}, bring your {jersey_color} jersey")
+    lines.append(f"📍 See ya'll {event['time']} at [{event['location']}]({event['location_link']})")
+    return "\n\n".join(lines)
 
 
-def get_next_game():
-    events = load_games()
-    now = datetime.now()
-    upcoming_events = []
-    for event in events:
-        event_datetime = event["datetime"]
-        if event_datetime > now:
-            upcoming_events.append((event_datetime, event))
-    if upcoming_events:
-        upcoming_events.sort(key=lambda x: x[0])
-        return upcoming_events[0][1]
-    return None
-
-
-def parse_player_string(player_str):
-    """Extract player name and number from a string like '#12. J. Doe'.
-    Returns a tuple of (name, number) or (None, None) if parsing fails.
-    Also removes capital C from the end of the name if it exists.
-    """
-    if not player_str:
-        return None, None
-    parts = player_str.split()
-    if len(parts) < 2:
-        return None, None
-    number = parts[0].lstrip("#")
-    if number.endswith("."):
-        number = number[:-1].strip()
-    name = " ".join(parts[1:])
-    if name.endswith("C"):
-        name = name[:-1].strip()
-    return name, number
-
-
-def parse_dusty_danglers_summary(game: dict):
-    """Fetch and format a Dusty Danglers game summary from AHA Hockey."""
-    game_link = game["game_link"]
-    resp = requests.get(game_link)
-    if resp.status_code != 200:
-        return "❌ Could not fetch game summary."
+def get_next_game(team: Team):
+    return team.schedule.next_game(clock.now())
+
 
-    soup = BeautifulSoup(resp.text, "html.parser")
-    summary = {}
+def is_final(game: Game, box: BoxScore) -> bool:
+    """A game is final once the scorebox says so, or once both scores are
+    posted and it ended a while ago."""
+    return box_is_final(box, game["datetime"], clock.now())
+
+
+# Result lines that only make sense for the Dusty Danglers
+danglers_loss_templates = [
+    "the danglers fell to the {opponent_name} with a final score of {opponent_score}-{dusty_score} :(",
+    "rusty danglers, am i right? we lost to the {opponent_name}, {opponent_score}-{dusty_score}.",
+    "breaking news, the dusty danglers are in fact dusty. they lost to the {opponent_name}, {opponent_score}-{dusty_score}.",
+    "i, the dusty dangler bot, simply would not have lost {opponent_score}-{dusty_score} to the {opponent_name}.",
+]
+danglers_win_templates = [
+    "the dusty danglers are simply built different. we beat the {opponent_name}, {dusty_score}-{opponent_score}.",
+    "how about them danglers? we beat the {opponent_name}, {dusty_score}-{opponent_score}.",
+    "perhaps the greatest hockey game ever played: dusty danglers {dusty_score}, {opponent_name} {opponent_score}.",
+]
+
+
+def format_summary(game: Game, box: BoxScore, team: TeamConfig) -> str:
+    """Render a parsed game summary as a Discord message."""
+    goals = box.goals
+    goalies = box.goalies
 
     # --- Game Info ---
-    summary["game_info"] = (
-        f"🏒 **Dusty Danglers vs {game['opponent']} ({game['datetime'].strftime('%b %d')})**"
+    game_info = (
+        f"🏒 **{team.name} vs {game['opponent']} ({game['datetime'].strftime('%b %d')})**"
     )
 
-    # --- Final Score ---
-    score_table = soup.find("table", class_="scorebox")
-    dusty_score = None
-    opponent_score = None
-    if score_table:
-        rows = score_table.find_all("tr")
-        for row in rows:
-            team_name = row.find("a")
-            if not team_name:
-                continue
-            tds = row.find_all("td")
-            team_score = tds[-1].get_text(strip=True)
-            if "Dusty Danglers" in team_name.text:
-                dusty_score = int(team_score)
-                summary["final_score"] = {
-                    "team": "Dusty Danglers",
-                    "periods": [td.get_text(strip=True) for td in tds[1:-1]],
-                    "final": team_score,
-                }
-            else:
-                opponent_score = int(team_score)
-                summary["opponent_score"] = {
-                    "team": team_name.text.strip(),
-                    "periods": [td.get_text(strip=True) for td in tds[1:-1]],
-                    "final": team_score,
-                }
+    dusty_score = int(box.final_score.final) if box.final_score else None
+    opponent_score = int(box.opponent_score.final) if box.opponent_score else None
 
     # Compute win/loss if both scores are known
     def format_loss_result(dusty_score, opponent_score, opponent_name):
         loss_result_templates = [
-            "the danglers fell to the {opponent_name} with a final score of {opponent_score}-{dusty_score} :(",
-            "rusty danglers, am i right? we lost to the {opponent_name}, {opponent_score}-{dusty_score}.",
             "turns out {dusty_score} is less than {opponent_score}. {opponent_name} beat us.",
             "{opponent_name} beat us??? how did we lose {opponent_score} to {dusty_score}??",
-            "breaking news, the dusty danglers are in fact dusty. they lost to the {opponent_name}, {opponent_score}-{dusty_score}.",
-            "i, the dusty dangler bot, simply would not have lost {opponent_score}-{dusty_score} to the {opponent_name}.",
             "i will pull this car over if you lose {opponent_score}-{dusty_score} to the {opponent_name} again.",
             "i'm tired of this, grandpa. we lost to the {opponent_name}, {opponent_score}-{dusty_score}.",
         ]
+        if team.name == TEAM_NAME:
+            loss_result_templates += danglers_loss_templates
         return random.choice(loss_result_templates).format(
             dusty_score=dusty_score,
             opponent_score=opponent_score,
@@ -215,17 +271,16 @@ def parse_dusty_danglers_summary(game: dict):
             "imagine losing to the {opponent_name}, i couldn't! we won {dusty_score}-{opponent_score}.",
             "i almost feel bad for the {opponent_name}, we won {dusty_score}-{opponent_score} so easily.",
             "that's how you win a hockey game. {dusty_score}-{opponent_score} over the {opponent_name}.",
-            "the dusty danglers are simply built different. we beat the {opponent_name}, {dusty_score}-{opponent_score}.",
             "another day, another W. we defeated the {opponent_name}, {dusty_score}-{opponent_score}.",
             "i would have bet my life savings on us winning {dusty_score}-{opponent_score} against {opponent_name}.",
             "did you see that? we crushed the {opponent_name}, {dusty_score}-{opponent_score}.",
             "i can't believe we won {dusty_score}-{opponent_score} against the {opponent_name}. oh wait yeah i can.",
             "we might never lose again. {opponent_name} lose {dusty_score}-{opponent_score}.",
             "remember when we lost to the {opponent_name}? me neither. cuz we won {dusty_score}-{opponent_score}.",
-            "how about them danglers? we beat the {opponent_name}, {dusty_score}-{opponent_score}.",
-            "perhaps the greatest hockey game ever played: dusty danglers {dusty_score}, {opponent_name} {opponent_score}.",
             "{dusty_score}>{opponent_score}, a mathematical proof that we beat the {opponent_name}.",
         ]
+        if team.name == TEAM_NAME:
+            win_result_templates += danglers_win_templates
         return random.choice(win_result_templates).format(
             dusty_score=dusty_score,
             opponent_score=opponent_score,
@@ -241,83 +296,24 @@ def parse_dusty_danglers_summary(game: dict):
         else:
             result = "🤝 **Tie Game.**"
 
-    # --- Goals ---
-    goals = []
-    for row in soup.select("h3:-soup-contains('Goals') + table tbody tr"):
-        if not (
-            row.find("td", string=lambda x: x and "Dusty Danglers" in x)
-            or row.find("img", alt="Dusty Danglers")
-        ):
-            continue
-        cols = row.find_all("td")
-        scorer_name, scorer_number = parse_player_string(cols[0].get_text(strip=True))
-        assist1_name, assist1_number = parse_player_string(cols[2].get_text(strip=True))
-        assist2_name, assist2_number = parse_player_string(cols[3].get_text(strip=True))
-        goals.append(
-            {
-                "scorer": f"#{scorer_number} {scorer_name}",
-                "assist1": (
-                    f"#{assist1_number} {assist1_name}" if assist1_name else None
-                ),
-                "assist2": (
-                    f"#{assist2_number} {assist2_name}" if assist2_name else None
-                ),
-                "period": cols[5].get_text(strip=True),
-                "time": cols[6].get_text(strip=True),
-            }
-        )
-    summary["goals"] = goals
-
-    # --- Goalies ---
-    goalies = []
-    for row in soup.select("h3:-soup-contains('Goalies') + table tbody tr"):
-        if not row.find("img", alt="Dusty Danglers"):
-            continue
-        cols = row.find_all("td")
-        goalie_name, goalie_number = parse_player_string(cols[0].get_text(strip=True))
-        goalies.append(
-            {
-                "player": f"#{goalie_number} {goalie_name}",
-                "shots_against": cols[2].get_text(strip=True),
-                "goals_against": cols[3].get_text(strip=True),
-                "save_pct": cols[4].get_text(strip=True),
-            }
-        )
-    summary["goalies"] = goalies
-
-    # --- Shots on Goal ---
-    shots = {}
-    for h3 in soup.find_all("h3"):
-        if h3.text.strip() == "Shots on Goal":
-            table = h3.find_next("table")
-            for row in table.find_all("tr"):
-                if row.find("img", alt="Dusty Danglers"):
-                    tds = row.find_all("td")
-                    shots = {
-                        "periods": [td.get_text(strip=True) for td in tds[1:-1]],
-                        "total": tds[-1].get_text(strip=True),
-                    }
-                    break
-    summary["shots_on_goal"] = shots
-
     # --- Format the Summary ---
     lines = []
-    lines.append(summary.get("game_info", ""))
+    lines.append(game_info)
 
     # Final score + result
-    if "final_score" in summary and "opponent_score" in summary:
+    if box.final_score and box.opponent_score:
         lines.append(f"*{result}*")
 
     # Shots on goal
-    if summary.get("shots_on_goal"):
-        s = summary["shots_on_goal"]
+    if box.shots_on_goal:
+        s = box.shots_on_goal
         period_labels = ["1st", "2nd", "3rd", "OT"]
         period_texts = []
-        for i, val in enumerate(s["periods"]):
+        for i, val in enumerate(s.periods):
             label = period_labels[i] if i < len(period_labels) else f"P{i+1}"
             period_texts.append(f"{label}: {val}")
         lines.append("\n🎯 **Shots on Goal**")
-        lines.append(" • " + " | ".join(period_texts) + f" | **Total: {s['total']}**")
+        lines.append(" • " + " | ".join(period_texts) + f" | **Total: {s.total}**")
 
     # Goals section
     if goals:
@@ -329,7 +325,7 @@ def parse_dusty_danglers_summary(game: dict):
         }
 
         for g in goals:
-            period = g["period"]
+            period = g.period
             if period not in period_goals:
                 period_goals[period] = []
             period_goals[period].append(g)
@@ -338,26 +334,26 @@ def parse_dusty_danglers_summary(game: dict):
             lines.append(f"\n⏱️ **Period {period} Goals**")
             for g in period_goals[period]:
                 assist_text = ""
-                if g["assist1"] and not g["assist2"]:
-                    assist_text = f" _(from {g['assist1']})_"
-                if g["assist1"] and g["assist2"]:
-                    assist_text = f" _(from {g['assist1']}, {g['assist2']})_"
-                if not g["assist1"] and not g["assist2"]:
+                if g.assist1 and not g.assist2:
+                    assist_text = f" _(from {g.assist1})_"
+                if g.assist1 and g.assist2:
+                    assist_text = f" _(from {g.assist1}, {g.assist2})_"
+                if not g.assist1 and not g.assist2:
                     assist_text = " _(Unassisted)_"
-                lines.append(f"• {g['time']} - {g['scorer']}{assist_text}")
+                lines.append(f"• {g.time} - {g.scorer}{assist_text}")
             if not period_goals[period]:
                 lines.append("• No goals scored in this period.")
 
         # tally goals and assists per player (track goals, assists, points)
         player_stats = {}
         for g in goals:
-            scorer = g["scorer"]
+            scorer = g.scorer
             if scorer not in player_stats:
                 player_stats[scorer] = {"goals": 0, "assists": 0, "points": 0}
             player_stats[scorer]["goals"] += 1
             player_stats[scorer]["points"] += 1
 
-            for assist in (g.get("assist1"), g.get("assist2")):
+            for assist in (g.assist1, g.assist2):
                 if assist:
                     if assist not in player_stats:
                         player_stats[assist] = {"goals": 0, "assists": 0, "points": 0}
@@ -389,37 +385,294 @@ def parse_dusty_danglers_summary(game: dict):
         lines.append("\n🧤 **Goalies**")
         for g in goalies:
             lines.append(
-                f"• {g['player']} — {g['shots_against']} SA | {g['goals_against']} GA | {g['save_pct']} SV%"
+                f"• {g.player} — {g.shots_against} SA | {g.goals_against} GA | {g.save_pct} SV%"
             )
-            if g["goals_against"] == "0":
+            if g.goals_against == "0":
                 lines.append("🎉🎉🎉 shutout!!! 🎉🎉🎉")
 
     return "\n".join(lines)
 
 
+async def load_box_score(
+    team: Team, game: Game, max_age: float | None = None
+) -> tuple[BoxScore, bool] | None:
+    """A team's box score for a game via the page cache, plus whether the game is final.
+
+    Returns None if the page couldn't be loaded. Raises FetchError if the
+    site is unreachable.
+    """
+    with metrics.timer("stage_seconds", stage="page"):
+        page = await page_cache.get_page(game["game_link"], fetcher, max_age=max_age, team=team.name)
+    if page.status != 200:
+        return None
+    if page.summary is not None:
+        box = BoxScore.from_dict(page.summary)
+    else:
+        with metrics.timer("stage_seconds", stage="parse"):
+            box = await workers.run_cpu(extract_box_score, page.html, team.name)
+    final = page.final or is_final(game, box)
+    if page.summary is None or final != page.final:
+        page_cache.store_summary(page.url, box.to_dict(), final, team=team.name)
+        if final and team.game_db:
+            team.game_db.record_box_score(game, box)
+    return box, final
+
+
+async def parse_dusty_danglers_summary(team: Team, game: dict):
+    """Fetch and format a team's game summary from AHA Hockey."""
+    try:
+        loaded = await load_box_score(team, game)
+    except FetchError:
+        return "❌ Could not fetch game summary."
+    if loaded is None:
+        return "❌ Could not fetch game summary."
+    box, _ = loaded
+    with metrics.timer("stage_seconds", stage="render"):
+        return format_summary(game, box, team.config)
+
+
+def season_lookups(team: Team) -> SeasonStats | SqliteGameStore:
+    """Where a team's season totals are read from, the game database if there is one."""
+    return team.game_db or team.season_stats
+
+
+def head_to_head(team: Team, report: ScoutReport) -> list[dict]:
+    """Our results against the scouted opponent, oldest first."""
+    if team.game_db:
+        return [g for g in team.game_db.games_vs(report.opponent) if g["result"]]
+    return report.head_to_head(team.name)
+
+
+def format_season_stats(stats: SeasonStats | SqliteGameStore, team: TeamConfig) -> str:
+    record = stats.record()
+    if not record["games"]:
+        return "No finished games to count yet."
+    lines = [
+        f"📊 **{team.name} Season Stats** ({record['games']} games)",
+        f"Record: **{record['wins']}-{record['losses']}-{record['ties']}**"
+        f" | GF {record['goals_for']} | GA {record['goals_against']}",
+    ]
+    leaders = stats.leaderboard("points", limit=5)
+    if leaders:
+        lines.append("\n🏒 **Top Scorers**")
+        for player, s in leaders:
+            lines.append(f"• {player} — {s['goals']}G {s['assists']}A **{s['points']}P**")
+    goalies = stats.goalie_lines()
+    if goalies:
+        lines.append("\n🧤 **Goalies**")
+        for player, s in goalies:
+            lines.append(
+                f"• {player} — {s['games']} GP | {s['gaa']:.2f} GAA | {s['save_pct']:.3f} SV%"
+            )
+    return "\n".join(lines)
+
+
+def format_leaderboard(stats: SeasonStats | SqliteGameStore, stat: str) -> str:
+    leaders = stats.leaderboard(stat)
+    if not leaders:
+        return "No goals counted yet. ope."
+    lines = [f"🏆 **{stat.title()} Leaders**"]
+    for rank, (player, s) in enumerate(leaders, start=1):
+        lines.append(f"{rank}. {player} — **{s[stat]}**")
+    return "\n".join(lines)
+
+
+def format_scout_report(report: ScoutReport, head_to_head: list[dict]) -> str:
+    r = report.record
+    lines = [
+        f"🔎 **Scouting [{report.opponent}]({report.opponent_link})**",
+        f"Record: **{r['wins']}-{r['losses']}-{r['ties']}** | GF {r['goals_for']} | GA {r['goals_against']}",
+    ]
+    recent = report.recent()
+    if recent:
+        lines.append("\n📅 **Recent Results**")
+        for g in recent:
+            lines.append(
+                f"• {g['datetime'].strftime('%b %d')} {g['result']} {g['goals_for']}-{g['goals_against']} vs {g['opponent']}"
+            )
+    if report.top_scorers:
+        lines.append("\n🏒 **Top Scorers**")
+        for player, s in report.top_scorers:
+            lines.append(f"• {player} — {s['goals']}G {s['assists']}A **{s['points']}P**")
+    lines.append("\n🤺 **Head to Head**")
+    if head_to_head:
+        for g in head_to_head:
+            lines.append(f"• {g['datetime'].strftime('%b %d, %Y')} {g['result']} {g['goals_for']}-{g['goals_against']}")
+    else:
+        lines.append("• First time we've played them.")
+    return "\n".join(lines)
+
+
+def format_scout_brief(report: ScoutReport, head_to_head: list[dict]) -> str:
+    r = report.record
+    line = f"🔎 {report.opponent} are {r['wins']}-{r['losses']}-{r['ties']}"
+    if report.top_scorers:
+        player, s = report.top_scorers[0]
+        line += f", watch out for {player} ({s['points']}P)"
+    if head_to_head:
+        results = [g["result"] for g in head_to_head]
+        line += f". We're {results.count('W')}-{results.count('L')}-{results.count('T')} against them"
+    return line
+
+
 # --- Bot events ---
+def command_tree_hash() -> str:
+    payload = {
+        "application_id": bot.application_id,
+        "commands": [c.to_dict(bot.tree) for c in bot.tree.get_commands()],
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+async def sync_commands_if_changed():
+    """Register slash commands with Discord, but only when their definitions changed.
+
+    Global syncs are heavily rate limited, so the hash of the last synced tree
+    is kept on disk.
+    """
+    digest = command_tree_hash()
+    try:
+        with open(COMMAND_HASH_FILE, "r") as f:
+            synced = f.read().strip()
+    except FileNotFoundError:
+        synced = None
+    if digest == synced:
+        print("✅ Slash commands unchanged, skipping sync")
+        return
+    await bot.tree.sync()
+    with open(COMMAND_HASH_FILE, "w") as f:
+        f.write(digest)
+    print("✅ Slash commands synced")
+
+
+# --- Metrics ---
+metrics.describe("command_seconds", "Slash command latency, from receipt to the last response")
+metrics.describe("commands_total", "Slash commands handled, by outcome")
+metrics.describe("fetch_seconds", "HTTP request latency per attempt")
+metrics.describe("stage_seconds", "Latency of summary and schedule pipeline stages")
+metrics.describe("scheduler_lag_seconds", "How late reminders start compared to when they were due")
+metrics.describe("reminder_failures_total", "Reminder handlers that raised and will be retried")
+
+# Interaction id -> perf_counter when it arrived
+command_started: dict[int, float] = {}
+
+
+def finish_command(interaction: discord.Interaction, outcome: str):
+    started = command_started.pop(interaction.id, None)
+    name = interaction.command.qualified_name if interaction.command else "unknown"
+    metrics.inc("commands_total", command=name, outcome=outcome)
+    if started is not None:
+        metrics.observe("command_seconds", time.perf_counter() - started, command=name)
+
+
+@bot.event
+async def on_interaction(interaction: discord.Interaction):
+    if interaction.type == discord.InteractionType.application_command:
+        command_started[interaction.id] = time.perf_counter()
+
+
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    finish_command(interaction, "ok")
+
+
+@bot.tree.error
+async def on_app_command_error(interaction: discord.Interaction, error: discord.app_commands.AppCommandError):
+    finish_command(interaction, "error")
+    # still log it the way the tree would by default
+    await discord.app_commands.CommandTree.on_error(bot.tree, interaction, error)
+
+
+def collect_component_stats() -> list[Sample]:
+    samples: list[Sample] = [
+        ("page_cache_lookups", {"result": result}, count) for result, count in page_cache.stats.items()
+    ]
+    samples.append(("page_cache_hit_ratio", {}, page_cache.hit_rate()))
+    pool = workers.stats()
+    for state in ("waiting", "running", "completed", "failed"):
+        samples.append(("worker_jobs", {"state": state}, pool[state]))
+    sends = dispatcher.summary()
+    for stat in ("pending", "messages", "coalesced", "retries", "failed"):
+        samples.append(("dispatcher_messages", {"state": stat}, sends[stat]))
+    samples.append(("dispatcher_latency_median_seconds", {}, sends["latency_median"]))
+    for name in supervisor.running():
+        samples.append(("background_task_restarts", {"task": name}, supervisor.restarts.get(name, 0)))
+    return samples
+
+
+metrics.add_collector(
+    "gauge", "Stats kept by the page cache, worker pool, dispatcher and supervisor", collect_component_stats
+)
+
+
+def runs_here(team: Team) -> bool:
+    """Whether this process runs the shard for the team's server.
+
+    Teams without a server go with shard 0, so only one process runs them.
+    """
+    return bot.shard_ids is None or shard_for(team.config, bot.shard_count) in bot.shard_ids
+
+
 @bot.event
 async def on_ready():
-    await bot.tree.sync()  # Registers all slash commands with Discord
     print(f"✅ Logged in as {bot.user}")
-    bot.loop.create_task(
-        daily_check_loop(hour=10, minute=00)
-    )  # Set your desired reminder time here
+    # All no-ops if the loops are already running from before a reconnect
+    for team in teams:
+        if not runs_here(team):
+            continue
+        supervisor.start(f"reminders:{team.config.key}", team.reminders.run)
+        if team.schedule_sync:
+            supervisor.start(f"schedule_sync:{team.config.key}", functools.partial(schedule_sync_loop, team))
 
 
 # --- Commands ---
+@functools.lru_cache(maxsize=32)
+def render_game_pages(games: tuple[tuple, ...], team: TeamConfig) -> tuple[str, ...]:
+    """Paged RSVP messages for a set of games, given as tuples of their items.
+
+    Everything the pages depend on is in the cache key, so they're only
+    rendered again when one of the games or the team's settings change.
+    """
+    return tuple(paginate([format_rsvp_message(dict(game), team) for game in games]))
+
+
+def parse_date_option(value: str | None):
+    return datetime.strptime(value, "%Y-%m-%d").date() if value else None
+
+
 @bot.tree.command(
-    name="list_games", description="List all upcoming Dusty Danglers games"
+    name="list_games", description="List all upcoming games"
 )
-async def list_games(interaction: discord.Interaction):
-    events = load_games()
+async def list_games(
+    interaction: discord.Interaction,
+    upcoming_only: bool = True,
+    home_or_away: Literal["Home", "Away"] | None = None,
+    opponent: str | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+):
+    """List games, optionally filtered.
+
+    Dates are YYYY-MM-DD and inclusive.
+    """
+    team = await require_team(interaction)
+    if not team:
+        return
+    try:
+        start = parse_date_option(start_date)
+        end = parse_date_option(end_date)
+    except ValueError:
+        await interaction.response.send_message("Dates should look like 2025-11-26.")
+        return
+    events = team.schedule.filter(upcoming_only, home_or_away, opponent, start, end, now=clock.now())
     if not events:
         await interaction.response.send_message("No games found.")
         return
-    messages = [format_rsvp_message(event) for event in events]
-    # Discord has message length limits; send in chunks if needed
-    for msg in messages:
-        await interaction.response.send_message(msg, suppress_embeds=True)
+    pages = render_game_pages(tuple(tuple(e.items()) for e in events), team.config)
+    # Discord only allows one response per interaction, the rest go out as followups
+    await interaction.response.send_message(pages[0], suppress_embeds=True)
+    for page in pages[1:]:
+        await interaction.followup.send(page, suppress_embeds=True)
 
 
 quotes = [
@@ -449,22 +702,28 @@ async def fine_yell(interaction: discord.Interaction, message: str):
 
 @bot.tree.command(name="game_day_message", description="Get a message for game day")
 async def game_day_message(interaction: discord.Interaction):
-    event = get_next_game()
+    team = await require_team(interaction)
+    if not team:
+        return
+    event = get_next_game(team)
     if not event:
         await interaction.response.send_message("No upcoming games found.")
         return
-    message = format_game_day_message(event)
+    message = format_game_day_message(event, team.config)
     await interaction.response.send_message(message, suppress_embeds=True)
 
 
 @bot.tree.command(name="next_game", description="Get the next upcoming game")
 async def next_game(interaction: discord.Interaction):
-    event = get_next_game()
+    team = await require_team(interaction)
+    if not team:
+        return
+    event = get_next_game(team)
     if not event:
         await interaction.response.send_message("No upcoming games found.")
         return
     await interaction.response.send_message(
-        format_rsvp_message(event), suppress_embeds=True
+        format_rsvp_message(event, team.config), suppress_embeds=True
     )
 
 
@@ -494,48 +753,355 @@ async def danglers_bot_message(interaction: discord.Interaction, message: str):
     name="summarize_latest_game", description="Get a summary of the latest game"
 )
 async def summarize_latest_game(interaction: discord.Interaction):
-    events = load_games()
-    if not events:
+    team = await require_team(interaction)
+    if not team:
+        return
+    if not load_games(team):
         await interaction.response.send_message("No games found.")
         return
-    # get the most recent past game
-    now = datetime.now()
-    past_events = []
-    for event in events:
-        event_datetime = event["datetime"]
-        if event_datetime < now:
-            past_events.append((event_datetime, event))
-    if not past_events:
+    latest_game = team.schedule.latest_game(clock.now())
+    if not latest_game:
         await interaction.response.send_message("No past games found.")
         return
-    past_events.sort(key=lambda x: x[0], reverse=True)
-    latest_game = past_events[0][1]
-    summary = parse_dusty_danglers_summary(latest_game)
-    await interaction.response.send_message(summary)
+    # Fetching and parsing can take longer than Discord's 3 second window
+    await interaction.response.defer()
+    summary = await workers.submit("summarize", parse_dusty_danglers_summary, team, latest_game)
+    await interaction.followup.send(summary)
+
+
+@functools.lru_cache(maxsize=32)
+def game_index_for(team_key: str, version: int) -> GameIndex:
+    return GameIndex(teams_by_key[team_key].schedule.games())
+
+
+def get_game_index(team: Team) -> GameIndex:
+    team.schedule.refresh()
+    return game_index_for(team.config.key, team.schedule.version)
+
+
+@bot.tree.command(name="summarize_game", description="Get a summary of any past game")
+async def summarize_game(interaction: discord.Interaction, game: str):
+    """Pick a game by opponent or date, e.g. "bold nov"."""
+    team = await require_team(interaction)
+    if not team:
+        return
+    index = get_game_index(team)
+    event = index.by_id.get(game)
+    if event is None:
+        # typed without picking a suggestion, take the newest match
+        matches = index.search(game, before=clock.now(), limit=1)
+        event = matches[0] if matches else None
+    if not event:
+        await interaction.response.send_message("No matching past game found.")
+        return
+    # Final games come straight out of the summary cache, newer ones may need a fetch
+    await interaction.response.defer()
+    summary = await workers.submit("summarize", parse_dusty_danglers_summary, team, event)
+    await interaction.followup.send(summary)
+
+
+@summarize_game.autocomplete("game")
+async def summarize_game_autocomplete(
+    interaction: discord.Interaction, current: str
+) -> list[discord.app_commands.Choice[str]]:
+    team = team_for(interaction)
+    if team is None:
+        return []
+    games = get_game_index(team).search(current, before=clock.now())
+    return [discord.app_commands.Choice(name=game_label(g), value=game_id(g)) for g in games]
+
+
+async def update_season_stats(team: Team):
+    await workers.submit(
+        "season_stats",
+        team.season_stats.update,
+        team.schedule.past_games(clock.now()),
+        functools.partial(load_box_score, team),
+    )
+
+
+@bot.tree.command(
+    name="season_stats", description="Team record, scorers and goalies this season"
+)
+async def season_stats_command(interaction: discord.Interaction):
+    team = await require_team(interaction)
+    if not team:
+        return
+    await interaction.response.defer()
+    await update_season_stats(team)
+    await interaction.followup.send(format_season_stats(season_lookups(team), team.config))
+
+
+@bot.tree.command(name="leaderboard", description="Season leaders for a stat")
+async def leaderboard(
+    interaction: discord.Interaction,
+    stat: Literal["points", "goals", "assists"] = "points",
+):
+    team = await require_team(interaction)
+    if not team:
+        return
+    # Usually nothing to fold, the post-game summary already did, but it may have missed a game
+    await interaction.response.defer()
+    await update_season_stats(team)
+    await interaction.followup.send(format_leaderboard(season_lookups(team), stat))
+
+
+@bot.tree.command(name="player_stats", description="Goals, assists and points for one player")
+async def player_stats(
+    interaction: discord.Interaction,
+    player: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+):
+    """Season totals, or between two dates with the SQLite backend.
+
+    Dates are YYYY-MM-DD and inclusive.
+    """
+    team = await require_team(interaction)
+    if not team:
+        return
+    try:
+        start = parse_date_option(start_date)
+        end = parse_date_option(end_date)
+    except ValueError:
+        await interaction.response.send_message("Dates should look like 2025-11-26.")
+        return
+    if team.game_db:
+        points = team.game_db.player_points(player, start, end)
+    elif start or end:
+        await interaction.response.send_message("Date ranges need STORAGE_BACKEND=sqlite.")
+        return
+    else:
+        points = team.season_stats.player(player)
+    await interaction.response.send_message(
+        f"🏒 {player} — {points['goals']}G {points['assists']}A **{points['points']}P**"
+    )
+
+
+@player_stats.autocomplete("player")
+async def player_stats_autocomplete(
+    interaction: discord.Interaction, current: str
+) -> list[discord.app_commands.Choice[str]]:
+    team = team_for(interaction)
+    if team is None:
+        return []
+    players = [p for p, _ in season_lookups(team).leaderboard(limit=1000)]
+    return [
+        discord.app_commands.Choice(name=p, value=p) for p in players if current.lower() in p.lower()
+    ][:25]
+
+
+@bot.tree.command(
+    name="sync_schedule", description="Update the schedule from the team page"
+)
+@discord.app_commands.default_permissions(manage_guild=True)
+async def sync_schedule(interaction: discord.Interaction):
+    team = await require_team(interaction)
+    if not team:
+        return
+    if not team.schedule_sync:
+        await interaction.response.send_message(f"No team page configured for {team.name}.")
+        return
+    await interaction.response.defer()
+    try:
+        diff = await workers.submit("sync_schedule", sync_schedule_now, team)
+    except FetchError:
+        await interaction.followup.send("❌ Could not fetch the team page.")
+        return
+    await interaction.followup.send(format_sync_report(diff))
+
+
+@bot.tree.command(name="scout", description="Scouting report on an opponent (default: next game's)")
+async def scout_command(interaction: discord.Interaction, opponent: str | None = None):
+    team = await require_team(interaction)
+    if not team:
+        return
+    games = team.schedule.games()
+    if opponent:
+        match = next((g for g in games if g["opponent"].lower() == opponent.lower()), None)
+        match = match or next((g for g in games if opponent.lower() in g["opponent"].lower()), None)
+    else:
+        match = get_next_game(team)
+    if not match:
+        await interaction.response.send_message("No matching opponent found.")
+        return
+    await interaction.response.defer()
+    try:
+        report = await workers.submit("scout", scout.report, match["opponent"], match["opponent_link"])
+    except FetchError:
+        await interaction.followup.send("❌ Could not fetch the opponent's team page.")
+        return
+    await interaction.followup.send(format_scout_report(report, head_to_head(team, report)), suppress_embeds=True)
+
+
+@scout_command.autocomplete("opponent")
+async def scout_autocomplete(
+    interaction: discord.Interaction, current: str
+) -> list[discord.app_commands.Choice[str]]:
+    team = team_for(interaction)
+    if team is None:
+        return []
+    opponents = sorted({g["opponent"] for g in team.schedule.games()})
+    return [
+        discord.app_commands.Choice(name=o, value=o) for o in opponents if current.lower() in o.lower()
+    ][:25]
+
+
+@bot.tree.command(
+    name="backfill_archive", description="Archive every past game page for offline re-parsing"
+)
+@discord.app_commands.default_permissions(manage_guild=True)
+async def backfill_archive(interaction: discord.Interaction):
+    if backfill_lock.locked():
+        await interaction.response.send_message("A backfill is already running.")
+        return
+    async with backfill_lock:
+        await interaction.response.defer()
+        urls = sorted({g["game_link"] for team in teams for g in team.schedule.past_games(clock.now())})
+        counts = await workers.submit("backfill", backfill, archive, urls, page_cache, fetcher)
+    await interaction.followup.send(
+        f"📦 Archived {counts['archived']} game pages ({counts['skipped']} already archived, "
+        f"{counts['failed']} failed). {len(archive)} total.\n"
+        "Run `python backfill.py reparse` to rebuild summaries from the archive."
+    )
+
+
+@bot.tree.command(name="bot_status", description="Show the bot's background work")
+async def bot_status(interaction: discord.Interaction):
+    stats = workers.stats()
+    lines = [
+        "⚙️ **Worker pool**",
+        f"Waiting: {stats['waiting']} | Running: {stats['running']} | "
+        f"Done: {stats['completed']} | Failed: {stats['failed']}",
+    ]
+    for name, job in stats["jobs"].items():
+        lines.append(
+            f"• {name} — {job['count']} runs | wait {job['wait_median']:.2f}s | "
+            f"run {job['run_median']:.2f}s (max {job['run_max']:.2f}s)"
+        )
+    lines.append(f"\n🔁 **Background tasks:** {', '.join(supervisor.running()) or 'none'}")
+    for name, count in supervisor.restarts.items():
+        lines.append(f"• {name} restarted {count} times")
+    sends = dispatcher.summary()
+    lines += [
+        "\n📬 **Outbound messages**",
+        f"Pending: {sends['pending']} | Sent: {sends['messages']} | Coalesced: {sends['coalesced']} | "
+        f"Retries: {sends['retries']} | Failed: {sends['failed']}",
+        f"Delivery latency: {sends['latency_median']:.2f}s median, {sends['latency_max']:.2f}s max",
+    ]
+    await interaction.response.send_message("\n".join(lines))
 
 
 # --- Automated reminders ---
-async def daily_check_loop(hour=8, minute=0):
-    print("🔍 Checking for games 3 days out...")
-    """Loop that checks games at a specific time each day"""
-    await bot.wait_until_ready()
-    while not bot.is_closed():
-        now = datetime.now()
-        target_time = datetime.combine(now.date(), dtime(hour, minute))
-        if now > target_time:
-            target_time += timedelta(days=1)
-        wait_seconds = (target_time - now).total_seconds()
-        await asyncio.sleep(wait_seconds)
-
-        channel = bot.get_channel(CHANNEL_ID)
-        events = load_games()
-        today = datetime.now().date()
-        for event in events:
-            event_datetime = event.get("datetime")
-            if event_datetime.date() - today == timedelta(days=3):
-                await channel.send(format_rsvp_message(event), suppress_embeds=True)
-            if event_datetime.date() == today:
-                await channel.send(format_game_day_message(event), suppress_embeds=True)
-
-
-bot.run(TOKEN)
+def format_pre_game_message(event: Game, team: TeamConfig):
+    return (
+        f"{team.role} 🚨 Puck drops in an hour vs {event['opponent']}!\n\n"
+        f"📍 [{event['location']}]({event['location_link']}) at {event['time']}"
+    )
+
+
+async def send_to_channel(team: Team, message: str, key: str | None = None):
+    """Post to the team's channel through the rate-limited dispatcher.
+
+    `key` identifies the post so retries never double-post it.
+    """
+    await dispatcher.send(team.config.channel_id, message, key=f"{team.config.key}:{key}" if key else None)
+
+
+async def send_rsvp_reminder(team: Team, event: Game):
+    message = format_rsvp_message(event, team.config)
+    if SCOUT_IN_RSVP:
+        try:
+            report = await asyncio.wait_for(scout.report(event["opponent"], event["opponent_link"]), 60)
+            message += f"\n\n{format_scout_brief(report, head_to_head(team, report))}"
+        except (FetchError, asyncio.TimeoutError) as e:
+            print(f"⚠️ Skipping scouting in RSVP: {e!r}")
+    await send_to_channel(team, message, key=f"{event['game_link']}:rsvp")
+
+
+async def send_game_day_reminder(team: Team, event: Game):
+    await send_to_channel(
+        team, format_game_day_message(event, team.config), key=f"{event['game_link']}:game_day"
+    )
+
+
+async def send_pre_game_reminder(team: Team, event: Game):
+    await send_to_channel(
+        team, format_pre_game_message(event, team.config), key=f"{event['game_link']}:pre_game"
+    )
+
+
+async def send_post_game_summary(team: Team, event: Game, box: BoxScore):
+    if team.season_stats.fold(event, box):
+        team.season_stats.save()
+    await send_to_channel(team, format_summary(event, box, team.config), key=f"{event['game_link']}:summary")
+
+
+async def watch_post_game(team: Team, event: Game):
+    await watch_for_final(
+        event,
+        functools.partial(load_box_score, team),
+        functools.partial(send_post_game_summary, team),
+        deadline=event["datetime"] + POST_GAME_DEADLINE,
+        clock=clock,
+        max_age=POST_GAME_MAX_AGE,
+    )
+
+
+def reminder_handlers(team: Team) -> dict:
+    handlers = {
+        "rsvp": send_rsvp_reminder,
+        "game_day": send_game_day_reminder,
+        "pre_game": send_pre_game_reminder,
+        "post_game": watch_post_game,
+    }
+    return {kind: functools.partial(handler, team) for kind, handler in handlers.items()}
+
+
+REMINDER_RULES = default_rules(hour=10, minute=0)  # Set your desired reminder time here
+
+for team in teams:
+    team.reminders = ReminderScheduler(
+        team.schedule, team.sent_log, reminder_handlers(team), rules=REMINDER_RULES, metrics=metrics
+    )
+
+
+# --- Schedule sync ---
+def format_sync_report(diff: ScheduleDiff | None) -> str:
+    if not diff:
+        return "📅 Schedule is up to date."
+    lines = ["📅 **Schedule updated**"]
+    for game in diff.added:
+        lines.append(f"➕ {game['date']} {game['time']} vs {game['opponent']}")
+    for before, after in diff.moved:
+        lines.append(
+            f"🔀 vs {after['opponent']}: {before['date']} {before['time']} @ {before['location']}"
+            f" → {after['date']} {after['time']} @ {after['location']}"
+        )
+    for game in diff.cancelled:
+        lines.append(f"❌ {game['date']} {game['time']} vs {game['opponent']} was cancelled")
+    return "\n".join(lines)
+
+
+async def sync_schedule_now(team: Team) -> ScheduleDiff | None:
+    diff = await team.schedule_sync.sync()
+    if diff and team.game_db:
+        team.game_db.import_events_json(team.config.events_file)
+    return diff
+
+
+async def schedule_sync_loop(team: Team, interval=timedelta(hours=6)):
+    while True:
+        try:
+            diff = await sync_schedule_now(team)
+            if diff:
+                await send_to_channel(team, format_sync_report(diff))
+        except FetchError as e:
+            print(f"⚠️ Schedule sync failed for {team.name}: {e}")
+        await asyncio.sleep(interval.total_seconds())
+
+
+if __name__ == "__main__":
+    if METRICS_PORT:
+        serve_metrics(metrics, port=int(METRICS_PORT), profiling=PROFILING)
+    bot.run(TOKEN)
@@ -0,0 +1,199 @@
+import bisect
+import collections
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from contextlib import contextmanager
+
+# Seconds, roughly log-spaced from a cache hit up to a slow scrape
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# (name, labels, value) for metrics read from other components at scrape time
+Sample = tuple[str, dict[str, str], float]
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(labels.items()))
+    return f"{{{inner}}}"
+
+
+class Metrics:
+    """Counters and latency histograms, rendered in Prometheus text format.
+
+    Observations can come from the event loop and from parse worker threads,
+    so updates take a lock. Stats other components already keep (page cache,
+    worker pool, dispatcher) are pulled in by collectors when scraped rather
+    than duplicated here.
+    """
+
+    def __init__(self, prefix: str = "danglers"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[tuple, float]] = collections.defaultdict(dict)
+        self._histograms: dict[str, dict[tuple, Histogram]] = collections.defaultdict(dict)
+        self._help: dict[str, str] = {}
+        self._collectors: list[tuple[str, str, Callable[[], Iterable[Sample]]]] = []
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms[name]
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe how long the block took, whether or not it raised."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def totals(self, name: str) -> tuple[int, float]:
+        """Observation count and sum of a histogram across all its labels."""
+        with self._lock:
+            series = self._histograms.get(name, {}).values()
+            return sum(h.count for h in series), sum(h.sum for h in series)
+
+    def add_collector(self, kind: str, help_text: str, collect: Callable[[], Iterable[Sample]]):
+        """Register a callable returning samples of `kind` ("gauge" or "counter") at scrape time."""
+        self._collectors.append((kind, help_text, collect))
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full = f"{self.prefix}_{name}"
+                lines.append(f"# HELP {full} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {full} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{full}{_labels(dict(key))} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                full = f"{self.prefix}_{name}"
+                lines.append(f"# HELP {full} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {full} histogram")
+                for key, hist in sorted(series.items()):
+                    labels = dict(key)
+                    cumulative = 0
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        cumulative += count
+                        lines.append(f"{full}_bucket{_labels({**labels, 'le': f'{bound:g}'})} {cumulative}")
+                    lines.append(f"{full}_bucket{_labels({**labels, 'le': '+Inf'})} {hist.count}")
+                    lines.append(f"{full}_sum{_labels(labels)} {hist.sum:.6f}")
+                    lines.append(f"{full}_count{_labels(labels)} {hist.count}")
+        seen = set()
+        for kind, help_text, collect in self._collectors:
+            for name, labels, value in collect():
+                full = f"{self.prefix}_{name}"
+                if full not in seen:
+                    seen.add(full)
+                    lines.append(f"# HELP {full} {help_text}")
+                    lines.append(f"# TYPE {full} {kind}")
+                lines.append(f"{full}{_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+# --- Profiling ---
+# Innermost functions of threads that are just waiting for work
+IDLE_FUNCTIONS = {"select", "poll", "wait", "_worker", "serve_forever"}
+
+
+class SamplingProfiler:
+    """Samples every thread's stack at a fixed interval and counts the hottest ones.
+
+    Sampling runs in its own thread, so it also catches the event loop being
+    blocked by something synchronous.
+    """
+
+    def __init__(self, interval: float = 0.005, depth: int = 12):
+        self.interval = interval
+        self.depth = depth
+        self.samples: collections.Counter[tuple[str, ...]] = collections.Counter()
+        self.total = 0
+
+    def _stack(self, frame) -> tuple[str, ...]:
+        stack = []
+        while frame is not None and len(stack) < self.depth:
+            code = frame.f_code
+            stack.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno} {code.co_name}")
+            frame = frame.f_back
+        return tuple(reversed(stack))
+
+    def sample_for(self, seconds: float):
+        own = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident != own and frame.f_code.co_name not in IDLE_FUNCTIONS:
+                    self.samples[self._stack(frame)] += 1
+                    self.total += 1
+            time.sleep(self.interval)
+
+    def report(self, limit: int = 15) -> str:
+        lines = [f"{self.total} busy samples"]
+        for stack, count in self.samples.most_common(limit):
+            lines.append(f"\n{count} ({count / self.total:.1%})")
+            lines.extend(f"  {frame}" for frame in stack)
+        return "\n".join(lines) + "\n"
+
+
+# --- HTTP endpoint ---
+def serve(metrics: Metrics, host: str = "127.0.0.1", port: int = 9108, profiling: bool = False):
+    """Expose /metrics (and /debug/profile if profiling is on) from a background thread."""
+    from flask import Flask, Response, request
+
+    app = Flask("danglers-metrics")
+
+    @app.get("/metrics")
+    def prometheus():
+        return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+    if profiling:
+
+        @app.get("/debug/profile")
+        def profile():
+            seconds = min(float(request.args.get("seconds", 10)), 60)
+            profiler = SamplingProfiler()
+            profiler.sample_for(seconds)
+            return Response(profiler.report(int(request.args.get("limit", 15))), mimetype="text/plain")
+
+    thread = threading.Thread(
+        target=app.run,
+        kwargs={"host": host, "port": port, "use_reloader": False, "threaded": True},
+        name="metrics",
+        daemon=True,
+    )
+    thread.start()
+    print(f"📈 Metrics on http://{host}:{port}/metrics")
+    return thread
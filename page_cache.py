@@ -0,0 +1,208 @@
+import asyncio
+import json
+import sqlite3
+from dataclasses import dataclass
+
+from boxscore import TEAM_NAME
+from clock import SYSTEM_CLOCK, Clock
+from fetch import Fetcher, FetchResult
+
+
+@dataclass
+class CachedPage:
+    url: str
+    status: int
+    html: str
+    final: bool
+    summary: dict | None
+
+
+class PageCache:
+    """On-disk cache of scraped pages and their parsed summaries, keyed by URL.
+
+    Pages marked final are served from disk forever. Other pages are served
+    for `ttl` seconds and then revalidated with a conditional GET using the
+    stored ETag/Last-Modified. The cache is LRU-evicted down to `max_bytes`.
+
+    Pages are shared by every team, summaries are kept per team since a box
+    score is parsed from one side of the game. Concurrent requests for the
+    same URL share one fetch, and the database runs in WAL mode so bot
+    processes on other shards can share the file.
+    """
+
+    def __init__(
+        self, path: str, max_bytes: int = 50_000_000, ttl: float = 600, clock: Clock = SYSTEM_CLOCK
+    ):
+        self.path = path
+        self.clock = clock
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0, "shared": 0}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                html TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                final INTEGER NOT NULL DEFAULT 0,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS summaries (
+                url TEXT NOT NULL,
+                team TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                PRIMARY KEY (url, team)
+            )
+            """
+        )
+        self.db.execute(
+            "CREATE INDEX IF NOT EXISTS pages_last_access ON pages (last_access)"
+        )
+        columns = [c[1] for c in self.db.execute("PRAGMA table_info(pages)")]
+        if "summary" in columns:
+            # Caches from before multi-team support held one summary per page, ours
+            self.db.execute(
+                "INSERT OR IGNORE INTO summaries SELECT url, ?, summary FROM pages WHERE summary IS NOT NULL",
+                (TEAM_NAME,),
+            )
+            self.db.execute("ALTER TABLE pages DROP COLUMN summary")
+        self.db.commit()
+
+    def _row(self, url: str, team: str):
+        return self.db.execute(
+            """
+            SELECT p.html, p.etag, p.last_modified, p.fetched_at, p.final, s.summary
+            FROM pages p LEFT JOIN summaries s ON s.url = p.url AND s.team = ?
+            WHERE p.url = ?
+            """,
+            (team, url),
+        ).fetchone()
+
+    def get(self, url: str, team: str = TEAM_NAME) -> CachedPage | None:
+        """Return the cached page without any freshness checks."""
+        row = self._row(url, team)
+        if row is None:
+            return None
+        html, _, _, _, final, summary = row
+        return CachedPage(url, 200, html, bool(final), json.loads(summary) if summary else None)
+
+    def put(self, url: str, html: str, etag: str | None = None, last_modified: str | None = None):
+        now = self.clock.now().timestamp()
+        self.db.execute(
+            """
+            INSERT OR REPLACE INTO pages
+                (url, html, etag, last_modified, fetched_at, last_access, final, size)
+            VALUES (?, ?, ?, ?, ?, ?, 0, ?)
+            """,
+            (url, html, etag, last_modified, now, now, len(html.encode())),
+        )
+        # a new copy of the page makes every team's summary of it stale
+        self.db.execute("DELETE FROM summaries WHERE url = ?", (url,))
+        self.db.commit()
+        self._evict()
+
+    def store_summary(self, url: str, summary: dict, final: bool, team: str = TEAM_NAME):
+        self.db.execute("UPDATE pages SET final = ? WHERE url = ?", (int(final), url))
+        self.db.execute(
+            "INSERT OR REPLACE INTO summaries (url, team, summary) VALUES (?, ?, ?)",
+            (url, team, json.dumps(summary)),
+        )
+        self.db.commit()
+
+    def _touch(self, url: str, revalidated: bool = False):
+        now = self.clock.now().timestamp()
+        if revalidated:
+            self.db.execute(
+                "UPDATE pages SET last_access = ?, fetched_at = ? WHERE url = ?",
+                (now, now, url),
+            )
+        else:
+            self.db.execute("UPDATE pages SET last_access = ? WHERE url = ?", (now, url))
+        self.db.commit()
+
+    def _evict(self):
+        (total,) = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()
+        if total <= self.max_bytes:
+            return
+        for url, size in self.db.execute(
+            "SELECT url, size FROM pages ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self.db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self.db.execute("DELETE FROM summaries WHERE url = ?", (url,))
+            total -= size
+            self.stats["evictions"] += 1
+        self.db.commit()
+
+    async def get_page(
+        self, url: str, fetcher: Fetcher, max_age: float | None = None, team: str = TEAM_NAME
+    ) -> CachedPage:
+        """Return a page, hitting the network only when the cached copy is stale.
+
+        `max_age` overrides the cache TTL, e.g. 0 to always revalidate a page
+        that is being watched. A non-200 response is returned with an empty
+        body and is not cached. The summary returned is `team`'s.
+        """
+        ttl = self.ttl if max_age is None else max_age
+        row = self._row(url, team)
+        if row is not None:
+            html, _, _, fetched_at, final, summary = row
+            if final or self.clock.now().timestamp() - fetched_at < ttl:
+                self.stats["hits"] += 1
+                self._touch(url)
+                return CachedPage(url, 200, html, bool(final), json.loads(summary) if summary else None)
+
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.create_task(self._refresh(url, fetcher))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        else:
+            self.stats["shared"] += 1
+        # shielded so one caller being cancelled doesn't cancel the fetch for the rest
+        resp = await asyncio.shield(task)
+        # Read back rather than use resp, another caller may have stored a summary meanwhile
+        if resp.status in (200, 304) and (row := self._row(url, team)) is not None:
+            html, _, _, _, final, summary = row
+            return CachedPage(url, 200, html, bool(final), json.loads(summary) if summary else None)
+        if resp.status != 200:
+            return CachedPage(url, resp.status, "", False, None)
+        return CachedPage(url, 200, resp.text, False, None)
+
+    async def _refresh(self, url: str, fetcher: Fetcher) -> FetchResult:
+        """Fetch a page, conditionally if a copy is cached, and store the result."""
+        row = self.db.execute("SELECT etag, last_modified FROM pages WHERE url = ?", (url,)).fetchone()
+        headers = {}
+        if row is not None:
+            etag, last_modified = row
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        resp = await fetcher.get(url, headers=headers or None)
+        if resp.status == 304 and row is not None:
+            self.stats["revalidated"] += 1
+            self._touch(url, revalidated=True)
+            return resp
+        self.stats["misses"] += 1
+        if resp.status == 200:
+            self.put(url, resp.text, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+        return resp
+
+    def hit_rate(self) -> float:
+        total = self.stats["hits"] + self.stats["revalidated"] + self.stats["misses"]
+        return (self.stats["hits"] + self.stats["revalidated"]) / total if total else 0.0
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,56 @@
+MESSAGE_LIMIT = 2000
+
+
+def paginate(chunks: list[str], limit: int = MESSAGE_LIMIT, sep: str = "\n\n") -> list[str]:
+    """Pack chunks into as few messages as fit under Discord's length limit.
+
+    Chunks are never reordered. A single chunk that is too long on its own is
+    split on line breaks (or hard-cut as a last resort).
+    """
+    return [page for page, _ in paginate_chunks(chunks, limit, sep)]
+
+
+def paginate_chunks(
+    chunks: list[str], limit: int = MESSAGE_LIMIT, sep: str = "\n\n"
+) -> list[tuple[str, list[int]]]:
+    """Like paginate, with the indexes of the chunks (or pieces of them) on each page."""
+    pages = []
+    current = ""
+    on_page: list[int] = []
+    for i, chunk in enumerate(chunks):
+        for piece in _split(chunk, limit):
+            candidate = f"{current}{sep}{piece}" if current else piece
+            if len(candidate) <= limit:
+                current = candidate
+            else:
+                pages.append((current, on_page))
+                current = piece
+                on_page = []
+            if not on_page or on_page[-1] != i:
+                on_page.append(i)
+    if current:
+        pages.append((current, on_page))
+    return pages
+
+
+def _split(chunk: str, limit: int) -> list[str]:
+    if len(chunk) <= limit:
+        return [chunk]
+    pieces = []
+    current = ""
+    for line in chunk.split("\n"):
+        while len(line) > limit:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(line[:limit])
+            line = line[limit:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) <= limit:
+            current = candidate
+        else:
+            pieces.append(current)
+            current = line
+    if current:
+        pieces.append(current)
+    return pieces
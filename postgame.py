@@ -0,0 +1,54 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
+from boxscore import BoxScore
+from clock import SYSTEM_CLOCK, Clock
+from fetch import FetchError
+from schedule import Game
+
+LoadBox = Callable[..., Awaitable[tuple[BoxScore, bool] | None]]
+
+
+async def watch_for_final(
+    game: Game,
+    load_box: LoadBox,
+    post: Callable[[Game, BoxScore], Awaitable[None]],
+    deadline: datetime,
+    first_interval: float = 120,
+    max_interval: float = 1200,
+    backoff: float = 1.5,
+    clock: Clock = SYSTEM_CLOCK,
+    max_age: float = 0,
+) -> bool:
+    """Poll a game's page until it shows a final score, then post it once.
+
+    Every poll is a conditional request, so an unchanged page costs a 304.
+    While the page keeps changing the poll stays at `first_interval`; once it
+    stops changing the interval grows by `backoff` up to `max_interval`.
+    A `max_age` above 0 lets a poll reuse a copy fetched that recently, e.g.
+    by the other team's watcher when both teams in a game use the bot.
+    Returns False if the deadline passed without a final score.
+    """
+    interval = first_interval
+    last_seen = None
+    while clock.now() < deadline:
+        try:
+            loaded = await load_box(game, max_age=max_age)
+        except FetchError as e:
+            print(f"⚠️ Couldn't check {game['game_link']}: {e}")
+            loaded = None
+        if loaded is not None:
+            box, final = loaded
+            if final:
+                await post(game, box)
+                return True
+            seen = box.to_dict()
+            interval = first_interval if seen != last_seen else min(interval * backoff, max_interval)
+            last_seen = seen
+        else:
+            interval = min(interval * backoff, max_interval)
+        remaining = (deadline - clock.now()).total_seconds()
+        await asyncio.sleep(max(0.0, min(interval, remaining)))
+    print(f"⌛ Gave up waiting for a final score vs {game['opponent']}")
+    return False
@@ -0,0 +1,206 @@
+import asyncio
+import heapq
+import json
+import os
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, time as dtime, timedelta
+
+from clock import SYSTEM_CLOCK, Clock
+from metrics import Metrics
+from schedule import Game, ScheduleStore
+
+Handler = Callable[[Game], Awaitable[None]]
+
+# Scheduled length of a game slot, and how long after puck drop we keep
+# waiting for a final score before giving up on the post-game summary
+GAME_LENGTH = timedelta(minutes=80)
+POST_GAME_DEADLINE = timedelta(hours=12)
+
+
+@dataclass(frozen=True)
+class ReminderRule:
+    """When a reminder of one kind is due for a game, and until when it's still worth sending."""
+
+    kind: str
+    due: Callable[[datetime], datetime]
+    expires: Callable[[datetime], datetime]
+
+
+def at_time_of_day(days_before: int, hour: int, minute: int = 0):
+    return lambda start: datetime.combine(
+        (start - timedelta(days=days_before)).date(), dtime(hour, minute)
+    )
+
+
+def default_rules(hour: int = 10, minute: int = 0) -> list[ReminderRule]:
+    return [
+        ReminderRule("rsvp", at_time_of_day(3, hour, minute), lambda start: start),
+        ReminderRule("game_day", at_time_of_day(0, hour, minute), lambda start: start),
+        ReminderRule("pre_game", lambda start: start - timedelta(hours=1), lambda start: start),
+        ReminderRule(
+            "post_game",
+            lambda start: start + GAME_LENGTH,
+            lambda start: start + POST_GAME_DEADLINE,
+        ),
+    ]
+
+
+@dataclass(order=True)
+class Reminder:
+    due: datetime
+    key: str = field(compare=False)
+    kind: str = field(compare=False)
+    expires: datetime = field(compare=False)
+    game: Game = field(compare=False)
+
+
+class SentLog:
+    """Persisted set of reminder keys that have already gone out."""
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with open(path, "r") as f:
+                self.sent: dict[str, str] = json.load(f)
+        except FileNotFoundError:
+            self.sent = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.sent
+
+    def mark(self, key: str, when: datetime):
+        self.sent[key] = when.isoformat(timespec="seconds")
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.sent, f, indent=1)
+        os.replace(tmp, self.path)
+
+
+class ReminderScheduler:
+    """Min-heap of every upcoming reminder, sleeping until the next one is due.
+
+    Reminders that were due while the bot was down are sent on startup as long
+    as they haven't expired, and the sent log keeps restarts from sending
+    anything twice.
+    """
+
+    def __init__(
+        self,
+        schedule: ScheduleStore,
+        sent_log: SentLog,
+        handlers: dict[str, Handler],
+        rules: list[ReminderRule] | None = None,
+        schedule_poll: float = 60,
+        retry_after: timedelta = timedelta(minutes=5),
+        metrics: Metrics | None = None,
+        clock: Clock = SYSTEM_CLOCK,
+    ):
+        self.schedule = schedule
+        self.sent_log = sent_log
+        self.handlers = handlers
+        self.rules = [r for r in (rules or default_rules()) if r.kind in handlers]
+        self.schedule_poll = schedule_poll
+        self.retry_after = retry_after
+        self.metrics = metrics
+        self.clock = clock
+        self._heap: list[Reminder] = []
+        self._pending: dict[str, Reminder] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._version = None
+
+    def _reminders_for(self, game: Game):
+        for rule in self.rules:
+            start = game["datetime"]
+            key = f"{game['game_link']}:{rule.kind}"
+            yield Reminder(rule.due(start), key, rule.kind, rule.expires(start), game)
+
+    def sync(self, now: datetime):
+        """Bring the heap up to date with the schedule.
+
+        Only reminders that are new or whose times moved are pushed; entries
+        for cancelled or moved games are dropped lazily when popped.
+        """
+        self.schedule.refresh()
+        if self._version == self.schedule.version:
+            return
+        self._version = self.schedule.version
+        wanted = {}
+        for game in self.schedule.games():
+            for reminder in self._reminders_for(game):
+                if (
+                    reminder.key in self.sent_log
+                    or (reminder.key in self._inflight and reminder.key not in self._pending)
+                    or reminder.expires <= now
+                ):
+                    continue
+                wanted[reminder.key] = reminder
+        pending = {}
+        for key, reminder in wanted.items():
+            current = self._pending.get(key)
+            if current is not None and current.game == reminder.game:
+                pending[key] = current
+            else:
+                pending[key] = reminder
+                heapq.heappush(self._heap, reminder)
+        self._pending = pending
+
+    def next_due(self) -> datetime | None:
+        while self._heap and self._pending.get(self._heap[0].key) is not self._heap[0]:
+            heapq.heappop(self._heap)
+        return self._heap[0].due if self._heap else None
+
+    def pop_due(self, now: datetime) -> list[Reminder]:
+        due = []
+        while self.next_due() is not None and self._heap[0].due <= now:
+            reminder = heapq.heappop(self._heap)
+            del self._pending[reminder.key]
+            if reminder.expires > now and reminder.key not in self.sent_log:
+                due.append(reminder)
+        return due
+
+    async def fire(self, reminder: Reminder):
+        try:
+            await self.handlers[reminder.kind](reminder.game)
+        except Exception as e:
+            if self.metrics:
+                self.metrics.inc("reminder_failures_total", kind=reminder.kind)
+            print(f"⚠️ {reminder.key} failed: {e!r}, retrying later")
+            retry = Reminder(
+                self.clock.now() + self.retry_after, reminder.key, reminder.kind, reminder.expires, reminder.game
+            )
+            self._pending[retry.key] = retry
+            heapq.heappush(self._heap, retry)
+            return
+        self.sent_log.mark(reminder.key, self.clock.now())
+        print(f"📨 Sent {reminder.kind} reminder for {reminder.game['opponent']}")
+
+    def start(self, reminder: Reminder):
+        """Run a handler in the background so slow ones (like watching for a
+        final score) don't hold up the rest of the heap."""
+        task = asyncio.create_task(self.fire(reminder))
+        self._inflight[reminder.key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(reminder.key, None))
+
+    async def wait_inflight(self):
+        """Wait for every handler that has already started to finish."""
+        await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+
+    async def run_once(self, now: datetime) -> float:
+        """Start everything due at `now`, return seconds until the next wake-up."""
+        self.sync(now)
+        for reminder in self.pop_due(now):
+            if self.metrics:
+                # how late the reminder is starting compared to when it was due
+                self.metrics.observe(
+                    "scheduler_lag_seconds", (now - reminder.due).total_seconds(), kind=reminder.kind
+                )
+            self.start(reminder)
+        next_due = self.next_due()
+        if next_due is None:
+            return self.schedule_poll
+        return max(0.0, min((next_due - now).total_seconds(), self.schedule_poll))
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(await self.run_once(self.clock.now()))
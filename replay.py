@@ -0,0 +1,201 @@
+"""Replay the reminder and posting pipeline over a date range in simulated time.
+
+Runs the real scheduler, handlers, dispatcher, page cache and fetcher. Game
+pages are served by a stub HTTP server from fixtures/ and messages go to a
+fake channel that records them. A full season takes well under a second:
+
+    python replay.py
+    python replay.py --start 2025-10-01 --end 2026-03-31 --out replay.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from aiohttp import web
+
+import main
+from clock import Clock, LoopClock, VirtualTimeLoop
+from dispatch import Dispatcher
+from fetch import Fetcher, FetchResult
+from jobs import WorkerPool
+from metrics import Metrics
+from page_cache import PageCache
+from reminders import ReminderScheduler, SentLog
+from schedule import BASE_URL, ScheduleStore
+from scout import Scout
+from stats import SeasonStats
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+@dataclass
+class SentMessage:
+    at: datetime
+    content: str
+
+
+class FakeChannel:
+    """Stands in for a discord.TextChannel, recording instead of sending."""
+
+    def __init__(self, clock: Clock):
+        self.clock = clock
+        self.sent: list[SentMessage] = []
+
+    async def send(self, content: str, nonce: str | None = None, suppress_embeds: bool = False):
+        self.sent.append(SentMessage(self.clock.now(), content))
+
+
+class StubSite:
+    """Local HTTP server that answers every game page with a final box score
+    and every team page with the same schedule."""
+
+    def __init__(self, game_html: str, team_html: str):
+        self.game_html = game_html
+        self.team_html = team_html
+        self.requests = 0
+        self.runner: web.AppRunner | None = None
+        self.base = ""
+
+    async def game_page(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        return web.Response(text=self.game_html, content_type="text/html", headers={"ETag": '"final"'})
+
+    async def team_page(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        return web.Response(text=self.team_html, content_type="text/html")
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/game/{id}", self.game_page)
+        app.router.add_get("/team/{path:.*}", self.team_page)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base = f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+class StubFetcher(Fetcher):
+    """The real Fetcher, pointed at the stub site instead of the league."""
+
+    def __init__(self, base: str, **kwargs):
+        super().__init__(**kwargs)
+        self.base = base
+
+    async def get(self, url: str, headers: dict[str, str] | None = None) -> FetchResult:
+        return await super().get(url.replace(BASE_URL, self.base), headers)
+
+
+@dataclass
+class ReplayResult:
+    start: datetime
+    end: datetime
+    messages: list[SentMessage] = field(default_factory=list)
+    page_requests: int = 0
+    scheduler_lag_mean: float = 0.0
+    wall_seconds: float = 0.0
+
+
+async def replay(events_file: str, start: datetime, end: datetime, tmp: str) -> ReplayResult:
+    clock = LoopClock(start)
+    channel = FakeChannel(clock)
+    with open(os.path.join(FIXTURES, "game_27009.html")) as f, open(os.path.join(FIXTURES, "team_schedule.html")) as t:
+        site = StubSite(f.read(), t.read())
+    await site.start()
+
+    # The handlers in main read these globals at call time
+    team = main.default_team
+    team.schedule = ScheduleStore(events_file)
+    team.game_db = None
+    team.season_stats = SeasonStats(os.path.join(tmp, "season_stats.json"), clock=clock)
+    main.clock = clock
+    main.page_cache = PageCache(os.path.join(tmp, "page_cache.sqlite3"), clock=clock)
+    main.fetcher = StubFetcher(site.base)
+    main.workers = WorkerPool(cpu_workers=0)
+    main.scout = Scout(main.page_cache, main.fetcher, run_cpu=main.workers.run_cpu, clock=clock)
+    main.dispatcher = Dispatcher(lambda channel_id: channel, clock=clock)
+
+    metrics = Metrics()
+    scheduler = ReminderScheduler(
+        team.schedule,
+        SentLog(os.path.join(tmp, "sent_reminders.json")),
+        main.reminder_handlers(team),
+        rules=main.REMINDER_RULES,
+        schedule_poll=6 * 3600,
+        metrics=metrics,
+        clock=clock,
+    )
+    started = time.perf_counter()
+    runner = asyncio.create_task(scheduler.run())
+    await asyncio.sleep((end - start).total_seconds())
+    runner.cancel()
+    # let anything already started (a post-game watch, a queued send) finish
+    await scheduler.wait_inflight()
+    await asyncio.gather(runner, return_exceptions=True)
+    wall = time.perf_counter() - started
+
+    await main.fetcher.close()
+    await site.stop()
+    main.page_cache.close()
+    lag_count, lag_sum = metrics.totals("scheduler_lag_seconds")
+    return ReplayResult(
+        start=start,
+        end=end,
+        messages=channel.sent,
+        page_requests=site.requests,
+        scheduler_lag_mean=lag_sum / lag_count if lag_count else 0.0,
+        wall_seconds=wall,
+    )
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", default=main.default_team.config.events_file)
+    parser.add_argument("--start", help="YYYY-MM-DD, default: a week before the first game")
+    parser.add_argument("--end", help="YYYY-MM-DD, default: a day after the last game")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the random message templates")
+    parser.add_argument("--out", help="write every recorded message here as JSON")
+    args = parser.parse_args(argv)
+
+    games = ScheduleStore(args.events).games()
+    if not games:
+        parser.error(f"No games in {args.events}")
+    start = (
+        datetime.strptime(args.start, "%Y-%m-%d") if args.start else games[0]["datetime"] - timedelta(days=7)
+    )
+    end = datetime.strptime(args.end, "%Y-%m-%d") if args.end else games[-1]["datetime"] + timedelta(days=1)
+
+    random.seed(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        result = asyncio.run(replay(args.events, start, end, tmp), loop_factory=VirtualTimeLoop)
+
+    for message in result.messages:
+        first_line = message.content.splitlines()[0]
+        print(f"{message.at:%a %b %d %Y %H:%M}  {first_line[:90]}")
+    days = (result.end - result.start).days
+    print(
+        f"\n🎬 {days} days, {len(result.messages)} messages, {result.page_requests} page fetches "
+        f"in {result.wall_seconds:.3f}s ({days / max(result.wall_seconds, 1e-9):,.0f} sim days/s)"
+    )
+    print(f"⏱️ Mean scheduler lag {result.scheduler_lag_mean:.1f}s (simulated)")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(
+                [{"at": m.at.isoformat(), "content": m.content} for m in result.messages], f, indent=2
+            )
+        print(f"📝 Wrote {len(result.messages)} messages to {args.out}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,159 @@
+import bisect
+import hashlib
+import json
+import os
+from datetime import date, datetime, time as dtime, timedelta
+from typing import TypedDict
+
+BASE_URL = "https://ahahockey.com"
+
+
+class Game(TypedDict):
+    date: str
+    time: str
+    opponent: str
+    opponent_link: str
+    home_or_away: str
+    location: str
+    location_link: str
+    game_link: str
+    datetime: datetime
+
+
+def parse_event_datetime(event):
+    dt_str = f"{event['date']} {event['time']}"
+    try:
+        parsed_date = datetime.strptime(dt_str, "%A %b %d %Y %I:%M %p")
+        return parsed_date
+    except ValueError:
+        return None
+
+
+def build_game(raw: dict, event_datetime: datetime) -> Game:
+    """Turn a raw events.json entry into a Game with absolute links."""
+    location = raw.get("location", "")
+    return {
+        "date": event_datetime.strftime("%A, %B %d"),
+        "time": event_datetime.strftime("%-I:%M%p"),
+        "datetime": event_datetime,
+        "opponent": raw.get("opponent", ""),
+        "opponent_link": f"{BASE_URL}{raw.get('opponent_link', '')}",
+        "home_or_away": raw.get("home_or_away", ""),
+        "location": location,
+        "game_link": f"{BASE_URL}{raw.get('game_link', '')}",
+        "location_link": f"https://www.google.com/maps/search/?api=1&query={location.replace(' ', '+')}+arena",
+    }
+
+
+class ScheduleStore:
+    """Parsed, datetime-sorted view of events.json.
+
+    The file is only re-read when its mtime/size changes, and only re-parsed
+    when its contents actually hash differently. Lookups are bisects over the
+    sorted datetimes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.version = 0
+        self._stamp = None
+        self._digest = None
+        self._games: list[Game] = []
+        self._times: list[datetime] = []
+
+    def refresh(self) -> bool:
+        """Reload the file if it changed. Returns True if the games changed."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            if self._games or self._stamp is not None:
+                self._load_from_bytes(b"[]", None)
+                return True
+            return False
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return False
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        return self._load_from_bytes(raw, stamp)
+
+    def _load_from_bytes(self, raw: bytes, stamp) -> bool:
+        self._stamp = stamp
+        digest = hashlib.sha1(raw).hexdigest()
+        if digest == self._digest:
+            return False
+        games = []
+        for entry in json.loads(raw or b"[]"):
+            event_datetime = parse_event_datetime(entry)
+            if event_datetime is None:
+                print(f"Broken date {entry.get('date', '')}")
+                continue
+            games.append(build_game(entry, event_datetime))
+        games.sort(key=lambda g: g["datetime"])
+        self._games = games
+        self._times = [g["datetime"] for g in games]
+        self._digest = digest
+        self.version += 1
+        return True
+
+    # --- Lookups ---
+    def games(self) -> list[Game]:
+        self.refresh()
+        return list(self._games)
+
+    def next_game(self, now: datetime | None = None) -> Game | None:
+        """First game strictly after now."""
+        self.refresh()
+        i = bisect.bisect_right(self._times, now or datetime.now())
+        return self._games[i] if i < len(self._games) else None
+
+    def latest_game(self, now: datetime | None = None) -> Game | None:
+        """Most recent game strictly before now."""
+        self.refresh()
+        i = bisect.bisect_left(self._times, now or datetime.now())
+        return self._games[i - 1] if i > 0 else None
+
+    def games_between(self, start: datetime, end: datetime) -> list[Game]:
+        """Games with start <= datetime < end."""
+        self.refresh()
+        lo = bisect.bisect_left(self._times, start)
+        hi = bisect.bisect_left(self._times, end)
+        return self._games[lo:hi]
+
+    def games_on(self, day: date) -> list[Game]:
+        start = datetime.combine(day, dtime.min)
+        return self.games_between(start, start + timedelta(days=1))
+
+    def past_games(self, now: datetime | None = None) -> list[Game]:
+        self.refresh()
+        i = bisect.bisect_left(self._times, now or datetime.now())
+        return self._games[:i]
+
+    def upcoming_games(self, now: datetime | None = None) -> list[Game]:
+        self.refresh()
+        i = bisect.bisect_right(self._times, now or datetime.now())
+        return self._games[i:]
+
+    def filter(
+        self,
+        upcoming_only: bool = False,
+        home_or_away: str | None = None,
+        opponent: str | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        now: datetime | None = None,
+    ) -> list[Game]:
+        """Games matching every given filter. Dates are inclusive."""
+        self.refresh()
+        lo = datetime.combine(start, dtime.min) if start else datetime.min
+        if upcoming_only:
+            lo = max(lo, (now or datetime.now()) + timedelta(microseconds=1))
+        i = bisect.bisect_left(self._times, lo)
+        # bisect_right on the last instant of the end date, since the next day may not exist
+        j = bisect.bisect_right(self._times, datetime.combine(end, dtime.max)) if end else len(self._times)
+        games = self._games[i:j]
+        if home_or_away:
+            games = [g for g in games if g["home_or_away"].lower() == home_or_away.lower()]
+        if opponent:
+            games = [g for g in games if opponent.lower() in g["opponent"].lower()]
+        return games
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from boxscore import DEFAULT_PARSER, TEAM_NAME, soup_tools
+from fetch import Fetcher
+from page_cache import PageCache
+from schedule import parse_event_datetime
+
+DATE_RE = re.compile(r"(Mon|Tue|Wed|Thu|Fri|Sat|Sun)\w*,?\s+([A-Z][a-z]{2})\w*\.?\s+(\d{1,2}),?\s+(\d{4})")
+TIME_RE = re.compile(r"(\d{1,2}:\d{2})\s*([AaPp])\.?[Mm]")
+EVENT_FIELDS = ("date", "time", "home_or_away", "location", "opponent", "opponent_link", "game_link")
+# Fields that make a game "moved" when they change
+MOVE_FIELDS = ("date", "time", "location", "home_or_away")
+
+
+@dataclass
+class ScheduleDiff:
+    added: list[dict] = field(default_factory=list)
+    moved: list[tuple[dict, dict]] = field(default_factory=list)
+    cancelled: list[dict] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.added or self.moved or self.cancelled)
+
+
+def _path(href: str) -> str:
+    return urlsplit(href).path
+
+
+def parse_team_schedule(html: str, team: str = TEAM_NAME) -> list[dict]:
+    """Pull games out of a team schedule page as events.json entries.
+
+    Any table row with a /game/ link is a game. The date and time are found by
+    pattern, the opponent is the /team/ link that isn't us, and home/away comes
+    from a Home/Away cell or an "@"/"vs" marker. Whatever cell is left over is
+    the location.
+    """
+    BeautifulSoup, SoupStrainer = soup_tools()
+    soup = BeautifulSoup(html, DEFAULT_PARSER, parse_only=SoupStrainer("tr"))
+    entries = []
+    for row in soup.find_all("tr"):
+        game_a = row.find("a", href=re.compile(r"/game/\d+"))
+        if not game_a:
+            continue
+        entry = {"game_link": _path(game_a["href"])}
+        location = None
+        for td in row.find_all("td"):
+            text = td.get_text(" ", strip=True)
+            date_match = DATE_RE.search(text)
+            time_match = TIME_RE.search(text)
+            team_a = td.find("a", href=re.compile(r"/team/"))
+            if date_match and "date" not in entry:
+                _, month, day, year = date_match.groups()
+                played_on = datetime.strptime(f"{month} {day} {year}", "%b %d %Y")
+                entry["date"] = played_on.strftime("%A %b %d %Y")
+            if time_match and "time" not in entry:
+                entry["time"] = f"{time_match.group(1)} {time_match.group(2).upper()}M"
+            if team_a and team not in team_a.get_text():
+                entry["opponent"] = team_a.get_text(strip=True)
+                entry["opponent_link"] = _path(team_a["href"])
+                if text.startswith("@"):
+                    entry["home_or_away"] = "Away"
+                elif text.lower().startswith("vs"):
+                    entry["home_or_away"] = "Home"
+            elif text in ("Home", "Away"):
+                entry["home_or_away"] = text
+            elif not (date_match or time_match or td.find("a", href=re.compile(r"/(game|team)/"))):
+                if text and location is None:
+                    location = text
+        entry["location"] = location or ""
+        if "date" in entry and "time" in entry and "opponent" in entry:
+            entry.setdefault("home_or_away", "")
+            entries.append({k: entry[k] for k in EVENT_FIELDS})
+    return entries
+
+
+def diff_schedule(old: list[dict], new: list[dict], now: datetime | None = None) -> tuple[list[dict], ScheduleDiff]:
+    """Merge a freshly scraped schedule into the current one.
+
+    Games are matched on game_link. Past games that dropped off the page are
+    kept as history; upcoming ones that disappeared are reported cancelled.
+    Returns the merged entries (sorted by date) and what changed.
+    """
+    now = now or datetime.now()
+    old_by_link = {g["game_link"]: g for g in old}
+    new_links = {g["game_link"] for g in new}
+    diff = ScheduleDiff()
+    merged = []
+    for game in new:
+        before = old_by_link.get(game["game_link"])
+        if before is None:
+            diff.added.append(game)
+            merged.append(game)
+            continue
+        # keep any hand-edited fields the page doesn't have
+        game = {**before, **{k: v for k, v in game.items() if v}}
+        if any(before.get(k) != game.get(k) for k in MOVE_FIELDS):
+            diff.moved.append((before, game))
+        merged.append(game)
+    for game in old:
+        if game["game_link"] in new_links:
+            continue
+        start = parse_event_datetime(game)
+        if start is not None and start > now:
+            diff.cancelled.append(game)
+        else:
+            merged.append(game)
+    merged.sort(key=lambda g: parse_event_datetime(g) or datetime.min)
+    return merged, diff
+
+
+def write_events(path: str, entries: list[dict]):
+    """Atomically replace events.json, keeping its tab-indented layout."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(entries, f, indent="\t")
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+class ScheduleSync:
+    """Keeps events.json in line with the team's schedule page."""
+
+    def __init__(
+        self,
+        events_file: str,
+        team_url: str,
+        page_cache: PageCache,
+        fetcher: Fetcher,
+        team: str = TEAM_NAME,
+    ):
+        self.events_file = events_file
+        self.team_url = team_url
+        self.team = team
+        self.page_cache = page_cache
+        self.fetcher = fetcher
+        self._last_digest = None
+
+    async def sync(self) -> ScheduleDiff | None:
+        """Fetch the team page and rewrite events.json if anything changed.
+
+        Returns None when the page couldn't be fetched or hasn't changed since
+        the last sync.
+        """
+        page = await self.page_cache.get_page(self.team_url, self.fetcher, max_age=0)
+        if page.status != 200:
+            print(f"⚠️ Schedule page returned {page.status}")
+            return None
+        digest = hashlib.sha1(page.html.encode()).hexdigest()
+        if digest == self._last_digest:
+            return None
+        scraped = parse_team_schedule(page.html, self.team)
+        if not scraped:
+            print("⚠️ No games found on the schedule page, leaving events.json alone")
+            return None
+        try:
+            with open(self.events_file, "r") as f:
+                current = json.load(f)
+        except FileNotFoundError:
+            current = []
+        merged, diff = diff_schedule(current, scraped)
+        if merged != current:
+            write_events(self.events_file, merged)
+        self._last_digest = digest
+        return diff
@@ -0,0 +1,165 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from boxscore import BoxScore, extract_box_score, is_final
+from clock import SYSTEM_CLOCK, Clock
+from fetch import Fetcher, FetchError
+from page_cache import PageCache
+from schedule import BASE_URL, parse_event_datetime
+from schedule_sync import parse_team_schedule
+
+
+@dataclass
+class ScoutReport:
+    opponent: str
+    opponent_link: str
+    record: dict
+    # Oldest first, from the opponent's point of view
+    results: list[dict] = field(default_factory=list)
+    top_scorers: list[tuple[str, dict]] = field(default_factory=list)
+    scouted_at: float = 0.0
+
+    def recent(self, count: int = 5) -> list[dict]:
+        """Latest results, newest first."""
+        return list(reversed(self.results))[:count]
+
+    def head_to_head(self, team: str) -> list[dict]:
+        """Games against `team`, oldest first and from `team`'s point of view."""
+        flipped = {"W": "L", "L": "W", "T": "T"}
+        return [
+            dict(g, goals_for=g["goals_against"], goals_against=g["goals_for"], result=flipped[g["result"]])
+            for g in self.results
+            if team in g["opponent"]
+        ]
+
+
+async def _run_inline(fn: Callable, *args):
+    return fn(*args)
+
+
+class Scout:
+    """Scouting reports built from an opponent's team page and their game pages.
+
+    Reports are kept per opponent for `ttl` seconds, and concurrent requests
+    for the same opponent share one scrape. The RSVP reminder days before a
+    game warms the cache for every /scout and reminder after it. All pages go
+    through the page cache, so finished game pages are only downloaded once
+    ever. Reports don't depend on who's asking, so every team shares them.
+    """
+
+    def __init__(
+        self,
+        page_cache: PageCache,
+        fetcher: Fetcher,
+        run_cpu: Callable[..., Awaitable] = _run_inline,
+        ttl: float = 4 * 24 * 3600,
+        max_fetches: int = 4,
+        clock: Clock = SYSTEM_CLOCK,
+    ):
+        self.page_cache = page_cache
+        self.fetcher = fetcher
+        self.run_cpu = run_cpu
+        self.ttl = ttl
+        self.max_fetches = max_fetches
+        self.clock = clock
+        self._reports: dict[str, ScoutReport] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def report(self, opponent: str, opponent_link: str) -> ScoutReport:
+        """Cached report for an opponent, scraping it if missing or stale.
+
+        Raises FetchError if the team page can't be loaded.
+        """
+        cached = self._reports.get(opponent_link)
+        if cached and self.clock.now().timestamp() - cached.scouted_at < self.ttl:
+            return cached
+        task = self._inflight.get(opponent_link)
+        if task is None:
+            task = asyncio.create_task(self._scrape(opponent, opponent_link))
+            self._inflight[opponent_link] = task
+            task.add_done_callback(lambda _: self._inflight.pop(opponent_link, None))
+            # Every caller may have given up waiting, so mark a failure as seen here
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        # shielded so one impatient caller timing out doesn't cancel it for the rest
+        report = await asyncio.shield(task)
+        self._reports[opponent_link] = report
+        return report
+
+    async def _load_box(self, url: str, opponent: str, played_at: datetime) -> BoxScore | None:
+        try:
+            page = await self.page_cache.get_page(url, self.fetcher, team=opponent)
+        except FetchError as e:
+            print(f"⚠️ Could not scout {url}: {e}")
+            return None
+        if page.status != 200:
+            return None
+        if page.summary is not None:
+            box = BoxScore.from_dict(page.summary)
+        else:
+            box = await self.run_cpu(extract_box_score, page.html, opponent)
+        # Marked final, the page is never fetched again
+        final = page.final or is_final(box, played_at, self.clock.now())
+        if page.summary is None or final != page.final:
+            self.page_cache.store_summary(url, box.to_dict(), final, team=opponent)
+        return box
+
+    async def _scrape(self, opponent: str, opponent_link: str) -> ScoutReport:
+        page = await self.page_cache.get_page(opponent_link, self.fetcher, max_age=self.ttl)
+        if page.status != 200:
+            raise FetchError(f"{opponent_link} returned {page.status}")
+        entries = await self.run_cpu(parse_team_schedule, page.html, opponent)
+        now = self.clock.now()
+        played = []
+        for entry in entries:
+            played_at = parse_event_datetime(entry)
+            if played_at and played_at < now:
+                played.append((played_at, entry))
+        played.sort(key=lambda p: p[0])
+
+        limit = asyncio.Semaphore(self.max_fetches)
+
+        async def load(played_at, entry):
+            async with limit:
+                return await self._load_box(f"{BASE_URL}{entry['game_link']}", opponent, played_at)
+
+        boxes = await asyncio.gather(*(load(played_at, entry) for played_at, entry in played))
+
+        record = {"wins": 0, "losses": 0, "ties": 0, "goals_for": 0, "goals_against": 0, "games": 0}
+        results = []
+        scorers: dict[str, dict] = {}
+        for (played_at, entry), box in zip(played, boxes):
+            if box is None or not (box.final_score and box.opponent_score):
+                continue
+            ours, theirs = int(box.final_score.final), int(box.opponent_score.final)
+            result = "W" if ours > theirs else "L" if ours < theirs else "T"
+            record[{"W": "wins", "L": "losses", "T": "ties"}[result]] += 1
+            record["goals_for"] += ours
+            record["goals_against"] += theirs
+            record["games"] += 1
+            results.append(
+                {
+                    "datetime": played_at,
+                    "opponent": entry["opponent"],
+                    "goals_for": ours,
+                    "goals_against": theirs,
+                    "result": result,
+                }
+            )
+            for g in box.goals:
+                for player, stat in ((g.scorer, "goals"), (g.assist1, "assists"), (g.assist2, "assists")):
+                    if player:
+                        s = scorers.setdefault(player, {"goals": 0, "assists": 0, "points": 0})
+                        s[stat] += 1
+                        s["points"] += 1
+
+        top = sorted(scorers.items(), key=lambda p: (p[1]["points"], p[1]["goals"]), reverse=True)
+        return ScoutReport(
+            opponent=opponent,
+            opponent_link=opponent_link,
+            record=record,
+            results=results,
+            top_scorers=top[:5],
+            scouted_at=now.timestamp(),
+        )
@@ -0,0 +1,162 @@
+import asyncio
+import json
+import os
+from collections.abc import Awaitable, Callable
+
+from boxscore import BoxScore
+from clock import SYSTEM_CLOCK, Clock
+from schedule import Game
+
+
+def _blank() -> dict:
+    return {
+        "games": {},
+        "record": {"wins": 0, "losses": 0, "ties": 0, "goals_for": 0, "goals_against": 0},
+        "players": {},
+        "goalies": {},
+    }
+
+
+def goalie_line(totals: dict) -> dict:
+    """A goalie's games, shots and goals against plus GAA and save percentage."""
+    saves = totals["shots_against"] - totals["goals_against"]
+    return dict(
+        totals,
+        gaa=totals["goals_against"] / totals["games"] if totals["games"] else 0.0,
+        save_pct=saves / totals["shots_against"] if totals["shots_against"] else 0.0,
+    )
+
+
+class SeasonStats:
+    """Season totals folded in one game at a time and persisted to JSON.
+
+    Each game link is folded exactly once, so updating only costs a fetch for
+    games that haven't been counted yet. Only final games are folded. A game
+    that couldn't be loaded or isn't final yet is skipped by updates for
+    `retry_after` seconds instead of being fetched again every time.
+    """
+
+    def __init__(self, path: str, max_fetches: int = 4, retry_after: float = 3600, clock: Clock = SYSTEM_CLOCK):
+        self.path = path
+        self.max_fetches = max_fetches
+        self.retry_after = retry_after
+        self.clock = clock
+        self._lock = asyncio.Lock()
+        # game link -> clock.monotonic() before which updates leave it alone
+        self._retry_at: dict[str, float] = {}
+        try:
+            with open(path, "r") as f:
+                self.data = json.load(f)
+        except FileNotFoundError:
+            self.data = _blank()
+
+    def save(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.data, f, indent=1)
+        os.replace(tmp, self.path)
+
+    def reset(self):
+        """Forget every folded game, e.g. before rebuilding from re-parsed pages."""
+        self.data = _blank()
+        self._retry_at.clear()
+
+    def has_game(self, game_link: str) -> bool:
+        return game_link in self.data["games"]
+
+    def fold(self, game: Game, box: BoxScore) -> bool:
+        """Add one game's box score to the totals. Returns False if already counted."""
+        link = game["game_link"]
+        if link in self.data["games"] or not (box.final_score and box.opponent_score):
+            return False
+
+        ours = int(box.final_score.final)
+        theirs = int(box.opponent_score.final)
+        record = self.data["record"]
+        result = "W" if ours > theirs else "L" if ours < theirs else "T"
+        record[{"W": "wins", "L": "losses", "T": "ties"}[result]] += 1
+        record["goals_for"] += ours
+        record["goals_against"] += theirs
+
+        players = self.data["players"]
+        for g in box.goals:
+            line = players.setdefault(g.scorer, {"goals": 0, "assists": 0, "points": 0})
+            line["goals"] += 1
+            line["points"] += 1
+            for assist in (g.assist1, g.assist2):
+                if assist:
+                    line = players.setdefault(assist, {"goals": 0, "assists": 0, "points": 0})
+                    line["assists"] += 1
+                    line["points"] += 1
+
+        goalies = self.data["goalies"]
+        for g in box.goalies:
+            line = goalies.setdefault(g.player, {"games": 0, "shots_against": 0, "goals_against": 0})
+            line["games"] += 1
+            line["shots_against"] += int(g.shots_against or 0)
+            line["goals_against"] += int(g.goals_against or 0)
+
+        self.data["games"][link] = {
+            "opponent": game["opponent"],
+            "date": game["datetime"].strftime("%Y-%m-%d"),
+            "result": result,
+            "score": f"{ours}-{theirs}",
+        }
+        return True
+
+    async def update(
+        self,
+        games: list[Game],
+        load_box: Callable[[Game], Awaitable[tuple[BoxScore, bool] | None]],
+    ) -> int:
+        """Fetch and fold every game not counted yet, a few at a time.
+
+        load_box returns (box score, is final) or None if the page couldn't
+        be loaded. Returns the number of games folded in.
+        """
+        async with self._lock:
+            now = self.clock.monotonic()
+            todo = [
+                g
+                for g in games
+                if not self.has_game(g["game_link"]) and self._retry_at.get(g["game_link"], 0) <= now
+            ]
+            if not todo:
+                return 0
+            limit = asyncio.Semaphore(self.max_fetches)
+
+            async def load(game):
+                async with limit:
+                    return await load_box(game)
+
+            results = await asyncio.gather(*(load(g) for g in todo), return_exceptions=True)
+            folded = 0
+            for game, result in zip(todo, results):
+                if isinstance(result, Exception):
+                    print(f"⚠️ Could not load {game['game_link']} for stats: {result!r}")
+                    result = None
+                if result is not None and result[1] and self.fold(game, result[0]):
+                    folded += 1
+                elif not self.has_game(game["game_link"]):
+                    self._retry_at[game["game_link"]] = now + self.retry_after
+            if folded:
+                self.save()
+            return folded
+
+    # --- Lookups ---
+    def record(self) -> dict:
+        return dict(self.data["record"], games=len(self.data["games"]))
+
+    def leaderboard(self, stat: str = "points", limit: int = 10) -> list[tuple[str, dict]]:
+        return sorted(
+            self.data["players"].items(),
+            key=lambda p: (p[1][stat], p[1]["points"], p[1]["goals"]),
+            reverse=True,
+        )[:limit]
+
+    def player(self, player: str) -> dict:
+        return self.data["players"].get(player, {"goals": 0, "assists": 0, "points": 0})
+
+    def goalie_lines(self) -> list[tuple[str, dict]]:
+        lines = [(player, goalie_line(s)) for player, s in self.data["goalies"].items()]
+        return sorted(lines, key=lambda g: g[1]["games"], reverse=True)
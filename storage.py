@@ -0,0 +1,336 @@
+import json
+import sqlite3
+from datetime import date, datetime, time as dtime, timedelta
+
+from boxscore import BoxScore
+from schedule import BASE_URL, Game, build_game, parse_event_datetime
+from stats import goalie_line
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    game_link TEXT PRIMARY KEY,
+    datetime TEXT NOT NULL,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    opponent TEXT NOT NULL,
+    opponent_link TEXT NOT NULL,
+    home_or_away TEXT NOT NULL,
+    location TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_datetime ON games (datetime);
+CREATE INDEX IF NOT EXISTS games_opponent ON games (opponent COLLATE NOCASE, datetime);
+
+CREATE TABLE IF NOT EXISTS results (
+    game_link TEXT PRIMARY KEY REFERENCES games (game_link) ON DELETE CASCADE,
+    goals_for INTEGER NOT NULL,
+    goals_against INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    status TEXT
+);
+
+CREATE TABLE IF NOT EXISTS goals (
+    game_link TEXT NOT NULL REFERENCES games (game_link) ON DELETE CASCADE,
+    period TEXT NOT NULL,
+    time TEXT NOT NULL,
+    scorer TEXT NOT NULL,
+    assist1 TEXT,
+    assist2 TEXT
+);
+CREATE INDEX IF NOT EXISTS goals_game ON goals (game_link);
+CREATE INDEX IF NOT EXISTS goals_scorer ON goals (scorer);
+CREATE INDEX IF NOT EXISTS goals_assist1 ON goals (assist1);
+CREATE INDEX IF NOT EXISTS goals_assist2 ON goals (assist2);
+
+CREATE TABLE IF NOT EXISTS goalies (
+    game_link TEXT NOT NULL REFERENCES games (game_link) ON DELETE CASCADE,
+    player TEXT NOT NULL,
+    shots_against INTEGER NOT NULL,
+    goals_against INTEGER NOT NULL,
+    save_pct TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS goalies_game ON goalies (game_link);
+CREATE INDEX IF NOT EXISTS goalies_player ON goalies (player);
+
+CREATE TABLE IF NOT EXISTS notifications (
+    key TEXT PRIMARY KEY,
+    sent_at TEXT NOT NULL
+);
+"""
+
+GAME_COLUMNS = "date, time, home_or_away, location, opponent, opponent_link, game_link, datetime"
+
+
+class SqliteGameStore:
+    """SQLite-backed alternative to ScheduleStore with the same lookup methods.
+
+    Also stores final results, goals and goalies per game so history queries
+    (games vs an opponent, a player's points in a date range) and the season
+    lookups SeasonStats has are indexed lookups.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.executescript(SCHEMA)
+        self.version = 0
+        self._data_version = None
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Bump `version` if the games changed, here or in another connection."""
+        (data_version,) = self.db.execute("PRAGMA data_version").fetchone()
+        if data_version == self._data_version:
+            return False
+        self._data_version = data_version
+        self.version += 1
+        return True
+
+    def _changed(self):
+        self.version += 1
+
+    def _games(self, where: str = "", params: tuple = (), order: str = "ASC", limit: int | None = None) -> list[Game]:
+        sql = f"SELECT {GAME_COLUMNS} FROM games {where} ORDER BY datetime {order}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        games = []
+        for row in self.db.execute(sql, params):
+            raw = dict(zip(GAME_COLUMNS.split(", "), row))
+            games.append(build_game(raw, datetime.fromisoformat(raw["datetime"])))
+        return games
+
+    # --- Import ---
+    def is_empty(self) -> bool:
+        return self.db.execute("SELECT 1 FROM games LIMIT 1").fetchone() is None
+
+    def import_events_json(self, path: str) -> int:
+        """Make the games table match an events.json file. Returns games imported.
+
+        Results, goals and goalies of games that are still in the file are kept.
+        """
+        with open(path, "r") as f:
+            entries = json.load(f)
+        rows = []
+        for entry in entries:
+            event_datetime = parse_event_datetime(entry)
+            if event_datetime is None:
+                print(f"Broken date {entry.get('date', '')}")
+                continue
+            rows.append(
+                (
+                    entry.get("game_link", ""),
+                    event_datetime.isoformat(),
+                    entry["date"],
+                    entry["time"],
+                    entry.get("opponent", ""),
+                    entry.get("opponent_link", ""),
+                    entry.get("home_or_away", ""),
+                    entry.get("location", ""),
+                )
+            )
+        with self.db:
+            self.db.executemany(
+                """
+                INSERT INTO games
+                    (game_link, datetime, date, time, opponent, opponent_link, home_or_away, location)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (game_link) DO UPDATE SET
+                    datetime = excluded.datetime, date = excluded.date, time = excluded.time,
+                    opponent = excluded.opponent, opponent_link = excluded.opponent_link,
+                    home_or_away = excluded.home_or_away, location = excluded.location
+                """,
+                rows,
+            )
+            links = [r[0] for r in rows]
+            self.db.execute(
+                f"DELETE FROM games WHERE game_link NOT IN ({','.join('?' * len(links))})", links
+            )
+        self._changed()
+        return len(rows)
+
+    def import_sent_log(self, path: str):
+        """Carry over reminders already sent according to a SentLog file."""
+        with open(path, "r") as f:
+            sent = json.load(f)
+        with self.db:
+            self.db.executemany("INSERT OR IGNORE INTO notifications VALUES (?, ?)", sent.items())
+
+    # --- Schedule lookups (same as ScheduleStore) ---
+    def games(self) -> list[Game]:
+        return self._games()
+
+    def next_game(self, now: datetime | None = None) -> Game | None:
+        games = self._games("WHERE datetime > ?", ((now or datetime.now()).isoformat(),), limit=1)
+        return games[0] if games else None
+
+    def latest_game(self, now: datetime | None = None) -> Game | None:
+        games = self._games(
+            "WHERE datetime < ?", ((now or datetime.now()).isoformat(),), order="DESC", limit=1
+        )
+        return games[0] if games else None
+
+    def games_between(self, start: datetime, end: datetime) -> list[Game]:
+        return self._games("WHERE datetime >= ? AND datetime < ?", (start.isoformat(), end.isoformat()))
+
+    def games_on(self, day: date) -> list[Game]:
+        start = datetime.combine(day, dtime.min)
+        return self.games_between(start, start + timedelta(days=1))
+
+    def past_games(self, now: datetime | None = None) -> list[Game]:
+        return self._games("WHERE datetime < ?", ((now or datetime.now()).isoformat(),))
+
+    def upcoming_games(self, now: datetime | None = None) -> list[Game]:
+        return self._games("WHERE datetime > ?", ((now or datetime.now()).isoformat(),))
+
+    def filter(
+        self,
+        upcoming_only: bool = False,
+        home_or_away: str | None = None,
+        opponent: str | None = None,
+        start: date | None = None,
+        end: date | None = None,
+        now: datetime | None = None,
+    ) -> list[Game]:
+        clauses, params = [], []
+        if upcoming_only:
+            clauses.append("datetime > ?")
+            params.append((now or datetime.now()).isoformat())
+        if start:
+            clauses.append("datetime >= ?")
+            params.append(datetime.combine(start, dtime.min).isoformat())
+        if end:
+            clauses.append("datetime <= ?")
+            params.append(datetime.combine(end, dtime.max).isoformat())
+        if home_or_away:
+            clauses.append("home_or_away = ? COLLATE NOCASE")
+            params.append(home_or_away)
+        if opponent:
+            clauses.append("opponent LIKE ?")
+            params.append(f"%{opponent}%")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self._games(where, tuple(params))
+
+    # --- Results ---
+    def record_box_score(self, game: Game, box: BoxScore):
+        """Store a final box score, replacing anything saved for the game before."""
+        if not (box.final_score and box.opponent_score):
+            return
+        link = game["game_link"].removeprefix(BASE_URL)
+        ours, theirs = int(box.final_score.final), int(box.opponent_score.final)
+        result = "W" if ours > theirs else "L" if ours < theirs else "T"
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (link, ours, theirs, result, box.status),
+            )
+            self.db.execute("DELETE FROM goals WHERE game_link = ?", (link,))
+            self.db.execute("DELETE FROM goalies WHERE game_link = ?", (link,))
+            self.db.executemany(
+                "INSERT INTO goals VALUES (?, ?, ?, ?, ?, ?)",
+                [(link, g.period, g.time, g.scorer, g.assist1, g.assist2) for g in box.goals],
+            )
+            self.db.executemany(
+                "INSERT INTO goalies VALUES (?, ?, ?, ?, ?)",
+                [
+                    (link, g.player, int(g.shots_against or 0), int(g.goals_against or 0), g.save_pct)
+                    for g in box.goalies
+                ],
+            )
+
+    def games_vs(self, opponent: str) -> list[dict]:
+        """Every game against an opponent with its result, if known."""
+        rows = self.db.execute(
+            """
+            SELECT g.datetime, g.opponent, g.game_link, r.goals_for, r.goals_against, r.result
+            FROM games g LEFT JOIN results r ON r.game_link = g.game_link
+            WHERE g.opponent = ? COLLATE NOCASE
+            ORDER BY g.datetime
+            """,
+            (opponent,),
+        )
+        keys = ("datetime", "opponent", "game_link", "goals_for", "goals_against", "result")
+        games = [dict(zip(keys, row)) for row in rows]
+        for game in games:
+            game["datetime"] = datetime.fromisoformat(game["datetime"])
+        return games
+
+    def player_points(self, player: str, start: date | None = None, end: date | None = None) -> dict:
+        """Goals, assists and points for a '#number name' player between two dates."""
+        lo = datetime.combine(start, dtime.min).isoformat() if start else ""
+        hi = datetime.combine(end, dtime.max).isoformat() if end else "9999"
+        (goals,) = self.db.execute(
+            """
+            SELECT COUNT(*) FROM goals JOIN games USING (game_link)
+            WHERE scorer = ? AND datetime >= ? AND datetime <= ?
+            """,
+            (player, lo, hi),
+        ).fetchone()
+        (assists,) = self.db.execute(
+            """
+            SELECT
+                (SELECT COUNT(*) FROM goals JOIN games USING (game_link)
+                 WHERE assist1 = ? AND datetime >= ? AND datetime <= ?)
+              + (SELECT COUNT(*) FROM goals JOIN games USING (game_link)
+                 WHERE assist2 = ? AND datetime >= ? AND datetime <= ?)
+            """,
+            (player, lo, hi, player, lo, hi),
+        ).fetchone()
+        return {"goals": goals, "assists": assists, "points": goals + assists}
+
+    # --- Season lookups (same as SeasonStats) ---
+    def record(self) -> dict:
+        row = self.db.execute(
+            """
+            SELECT COUNT(*), SUM(result = 'W'), SUM(result = 'L'), SUM(result = 'T'),
+                SUM(goals_for), SUM(goals_against)
+            FROM results
+            """
+        ).fetchone()
+        games, wins, losses, ties, goals_for, goals_against = (v or 0 for v in row)
+        return {
+            "wins": wins,
+            "losses": losses,
+            "ties": ties,
+            "goals_for": goals_for,
+            "goals_against": goals_against,
+            "games": games,
+        }
+
+    def leaderboard(self, stat: str = "points", limit: int = 10) -> list[tuple[str, dict]]:
+        rows = self.db.execute(
+            """
+            SELECT player, SUM(goal), SUM(assist) FROM (
+                SELECT scorer AS player, 1 AS goal, 0 AS assist FROM goals
+                UNION ALL SELECT assist1, 0, 1 FROM goals WHERE assist1 != ''
+                UNION ALL SELECT assist2, 0, 1 FROM goals WHERE assist2 != ''
+            )
+            GROUP BY player
+            """
+        )
+        players = [(p, {"goals": g, "assists": a, "points": g + a}) for p, g, a in rows]
+        return sorted(players, key=lambda p: (p[1][stat], p[1]["points"], p[1]["goals"]), reverse=True)[:limit]
+
+    def goalie_lines(self) -> list[tuple[str, dict]]:
+        rows = self.db.execute(
+            "SELECT player, COUNT(*), SUM(shots_against), SUM(goals_against) FROM goalies GROUP BY player"
+        )
+        lines = [
+            (player, goalie_line({"games": games, "shots_against": shots, "goals_against": against}))
+            for player, games, shots, against in rows
+        ]
+        return sorted(lines, key=lambda g: g[1]["games"], reverse=True)
+
+    # --- Sent reminders ---
+    def __contains__(self, key: str) -> bool:
+        return self.db.execute("SELECT 1 FROM notifications WHERE key = ?", (key,)).fetchone() is not None
+
+    def mark(self, key: str, when: datetime):
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO notifications VALUES (?, ?)",
+                (key, when.isoformat(timespec="seconds")),
+            )
+
+    def close(self):
+        self.db.close()
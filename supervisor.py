@@ -0,0 +1,54 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+
+class Supervisor:
+    """Runs named background loops, one instance each.
+
+    Starting a name that is already running does nothing, so it's safe to
+    call from on_ready after every reconnect. A loop that crashes is started
+    again after a backoff that doubles up to `max_backoff`; `stop` cancels
+    everything and waits for it to finish.
+    """
+
+    def __init__(self, min_backoff: float = 1.0, max_backoff: float = 300.0):
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.restarts: dict[str, int] = {}
+
+    def start(self, name: str, factory: Callable[[], Awaitable]) -> bool:
+        """Start `factory()` under `name` unless it is already running."""
+        task = self._tasks.get(name)
+        if task and not task.done():
+            return False
+        self._tasks[name] = asyncio.create_task(self._keep_running(name, factory), name=name)
+        return True
+
+    async def _keep_running(self, name: str, factory: Callable[[], Awaitable]):
+        backoff = self.min_backoff
+        while True:
+            started = asyncio.get_running_loop().time()
+            try:
+                await factory()
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.restarts[name] = self.restarts.get(name, 0) + 1
+                # a loop that ran fine for a good while starts over at the short backoff
+                if asyncio.get_running_loop().time() - started > self.max_backoff:
+                    backoff = self.min_backoff
+                print(f"💥 {name} crashed ({e!r}), restarting in {backoff:.0f}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def running(self) -> list[str]:
+        return [name for name, task in self._tasks.items() if not task.done()]
+
+    async def stop(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
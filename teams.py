@@ -0,0 +1,156 @@
+import json
+import os
+import re
+from dataclasses import dataclass, fields
+
+from boxscore import BoxScore
+from fetch import Fetcher
+from page_cache import PageCache
+from reminders import ReminderScheduler, SentLog
+from schedule import BASE_URL, ScheduleStore
+from schedule_sync import ScheduleSync
+from stats import SeasonStats
+from storage import SqliteGameStore
+
+# Where per-team files go when teams.json doesn't name them
+TEAMS_DIR = "./teams"
+
+
+def slugify(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+@dataclass(frozen=True)
+class TeamConfig:
+    """Everything that differs between the teams one bot serves.
+
+    `guild_id` None means any server without a team of its own, which is how
+    a single-team setup from the environment works.
+    """
+
+    key: str
+    name: str
+    channel_id: int
+    guild_id: int | None = None
+    # Team page the schedule is synced from, e.g. /team/dusty-danglers/1234
+    team_link: str | None = None
+    role: str = "@everyone"
+    emoji_home: str = "🏠"
+    emoji_away: str = "🚌"
+    # Who gets the personal jersey reminder on game day, if anyone
+    jersey_reminder: str | None = None
+    events_file: str = ""
+    stats_file: str = ""
+    sent_log_file: str = ""
+    games_db_file: str = ""
+
+    def __post_init__(self):
+        files = {
+            "events_file": "events.json",
+            "stats_file": "season_stats.json",
+            "sent_log_file": "sent_reminders.json",
+            "games_db_file": "games.sqlite3",
+        }
+        for attr, filename in files.items():
+            if not getattr(self, attr):
+                object.__setattr__(self, attr, os.path.join(TEAMS_DIR, self.key, filename))
+
+
+def load_team_configs(path: str, default: TeamConfig) -> list[TeamConfig]:
+    """Teams from a JSON list of TeamConfig fields, or just `default` without the file.
+
+    `key` defaults to the slugged team name and has to be unique.
+    """
+    try:
+        with open(path, "r") as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return [default]
+    known = {f.name for f in fields(TeamConfig)}
+    configs = []
+    for entry in raw:
+        unknown = set(entry) - known
+        if unknown:
+            raise ValueError(f"{path}: unknown team settings {sorted(unknown)}")
+        entry = dict(entry, key=entry.get("key") or slugify(entry["name"]))
+        for attr in ("channel_id", "guild_id"):
+            if entry.get(attr) is not None:
+                entry[attr] = int(entry[attr])  # snowflakes are often quoted
+        configs.append(TeamConfig(**entry))
+    keys = [c.key for c in configs]
+    duplicates = {k for k in keys if keys.count(k) > 1}
+    if duplicates:
+        raise ValueError(f"{path}: duplicate team keys {sorted(duplicates)}, set a distinct key")
+    return configs
+
+
+@dataclass
+class Team:
+    """A team's own stores. The page cache, fetcher and workers are shared."""
+
+    config: TeamConfig
+    schedule: ScheduleStore | SqliteGameStore
+    season_stats: SeasonStats
+    sent_log: SentLog | SqliteGameStore
+    game_db: SqliteGameStore | None = None
+    schedule_sync: ScheduleSync | None = None
+    # Set up by the bot, since the handlers post through it
+    reminders: ReminderScheduler | None = None
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+
+def find_team(teams: list[Team], guild_id: int | None, channel_id: int | None) -> Team | None:
+    """The team a command is for: the one set up for this server, preferring
+    this channel's if a server has several."""
+    here = [t for t in teams if t.config.guild_id == guild_id]
+    here = here or [t for t in teams if t.config.guild_id is None]
+    if not here:
+        return None
+    return next((t for t in here if t.config.channel_id == channel_id), here[0])
+
+
+def shard_for(config: TeamConfig, shard_count: int | None) -> int:
+    """The shard Discord puts the team's server on, 0 for a team without one."""
+    if config.guild_id is None or not shard_count:
+        return 0
+    return (config.guild_id >> 22) % shard_count
+
+
+def open_game_db(config: TeamConfig, page_cache: PageCache) -> SqliteGameStore:
+    db = SqliteGameStore(config.games_db_file)
+    if db.is_empty() and os.path.exists(config.events_file):
+        # One-time import, after this events.json is only re-imported on schedule sync
+        count = db.import_events_json(config.events_file)
+        if os.path.exists(config.sent_log_file):
+            db.import_sent_log(config.sent_log_file)
+        # Final games already in the page cache won't go through load_box_score again
+        results = 0
+        for game in db.games():
+            page = page_cache.get(game["game_link"], config.name)
+            if page and page.final and page.summary:
+                db.record_box_score(game, BoxScore.from_dict(page.summary))
+                results += 1
+        print(f"📦 Imported {count} games and {results} final box scores into {config.games_db_file}")
+    return db
+
+
+def open_team(config: TeamConfig, page_cache: PageCache, fetcher: Fetcher, storage: str = "json") -> Team:
+    for path in (config.events_file, config.stats_file, config.sent_log_file, config.games_db_file):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    game_db = open_game_db(config, page_cache) if storage == "sqlite" else None
+    sync = (
+        ScheduleSync(config.events_file, f"{BASE_URL}{config.team_link}", page_cache, fetcher, team=config.name)
+        if config.team_link
+        else None
+    )
+    return Team(
+        config=config,
+        schedule=game_db or ScheduleStore(config.events_file),
+        season_stats=SeasonStats(config.stats_file),
+        sent_log=game_db or SentLog(config.sent_log_file),
+        game_db=game_db,
+        schedule_sync=sync,
+    )
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+
+from archive import PageArchive
+
+
+class PageArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "pages.archive")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_instances_sharing_a_file_see_each_others_pages(self):
+        bot, cli = PageArchive(self.path), PageArchive(self.path)
+        bot.append("/game/1", "<html>one</html>")
+        cli.append("/game/2", "<html>two</html>")
+        bot.append("/game/3", "<html>three</html>")
+
+        # nothing was written over, and a fresh open keeps everything
+        reopened = PageArchive(self.path)
+        self.assertEqual(len(reopened), 3)
+        self.assertEqual(reopened.get("/game/2"), "<html>two</html>")
+        self.assertEqual(bot.get("/game/2"), "<html>two</html>")
+        cli.refresh()
+        self.assertEqual(cli.get("/game/3"), "<html>three</html>")
+
+    def test_half_written_record_is_cut_off(self):
+        archive = PageArchive(self.path)
+        archive.append("/game/1", "<html>one</html>")
+        size = os.path.getsize(self.path)
+        with open(self.path, "ab") as f:
+            f.write(b"DDA1 torn")
+        with open(f"{self.path}.idx", "a") as idx:
+            idx.write('["/game/2", ')
+
+        reopened = PageArchive(self.path)
+        self.assertEqual(os.path.getsize(self.path), size)
+        self.assertNotIn("/game/2", reopened)
+        reopened.append("/game/2", "<html>two</html>")
+        self.assertEqual(PageArchive(self.path).get("/game/2"), "<html>two</html>")
+
+    def test_missing_index_is_rebuilt(self):
+        archive = PageArchive(self.path)
+        archive.append("/game/1", "<html>one</html>")
+        archive.append("/game/1", "<html>one, final</html>")
+        os.remove(f"{self.path}.idx")
+        self.assertEqual(PageArchive(self.path).get("/game/1"), "<html>one, final</html>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import json
+import os
+import unittest
+
+from boxscore import DEFAULT_PARSER, extract_box_score
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+GAMES = ["game_26906", "game_27009"]
+# Expected output was recorded with the original per-section BeautifulSoup
+# selectors, which didn't report the scorebox status
+PARSERS = sorted({"html.parser", DEFAULT_PARSER})
+
+
+def load(game: str) -> tuple[str, dict]:
+    with open(os.path.join(FIXTURES, f"{game}.html")) as f:
+        html = f.read()
+    with open(os.path.join(FIXTURES, f"{game}.expected.json")) as f:
+        expected = json.load(f)
+    return html, expected
+
+
+def parsed(html: str, parser: str) -> dict:
+    box = extract_box_score(html, parser=parser).to_dict()
+    box.pop("status", None)
+    return box
+
+
+class ExtractBoxScoreTest(unittest.TestCase):
+    def test_matches_original_parser(self):
+        for game in GAMES:
+            html, expected = load(game)
+            for parser in PARSERS:
+                with self.subTest(game=game, parser=parser):
+                    self.assertEqual(parsed(html, parser), expected)
+
+    def test_tables_inside_a_layout_table(self):
+        for game in GAMES:
+            html, expected = load(game)
+            body = html.split("<body", 1)[1].split(">", 1)[1].rsplit("</body>", 1)[0]
+            wrapped = f"<html><body><table><tr><td>{body}</td></tr></table></body></html>"
+            for parser in PARSERS:
+                with self.subTest(game=game, parser=parser):
+                    self.assertEqual(parsed(wrapped, parser), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+import discord
+
+from clock import VirtualTimeLoop
+from dispatch import Dispatcher, make_nonce
+
+
+class FakeChannel:
+    """Records every send attempt and refuses content containing `refuse`."""
+
+    def __init__(self):
+        self.attempts: list[tuple[str, str]] = []
+        self.posted: list[str] = []
+        self.refuse: str | None = None
+
+    async def send(self, content: str, nonce: str, suppress_embeds: bool):
+        self.attempts.append((content, nonce))
+        if self.refuse and self.refuse in content:
+            raise discord.HTTPException(SimpleNamespace(status=403, reason="Forbidden"), "Missing Access")
+        self.posted.append(content)
+
+
+class DispatcherTest(unittest.TestCase):
+    def run_virtual(self, coro):
+        return asyncio.run(coro, loop_factory=VirtualTimeLoop)
+
+    def test_partial_failure_and_retry_never_double_posts(self):
+        channel = FakeChannel()
+        first, second, third = "a" * 1500, "b" * 1500, "c" * 10
+
+        async def scenario():
+            dispatcher = Dispatcher(lambda channel_id: channel)
+            channel.refuse = "b"
+            # too long to share a page, so they go out as two pages of one batch
+            results = await asyncio.gather(
+                dispatcher.send(1, first, key="first"),
+                dispatcher.send(1, second, key="second"),
+                return_exceptions=True,
+            )
+            self.assertIsNone(results[0])
+            self.assertIsInstance(results[1], discord.HTTPException)
+            self.assertEqual(channel.posted, [first])
+
+            # the failed message is sent again, this time queued with a new one
+            channel.refuse = None
+            await asyncio.gather(dispatcher.send(1, second, key="second"), dispatcher.send(1, third, key="third"))
+            return dispatcher
+
+        dispatcher = self.run_virtual(scenario())
+        self.assertEqual(channel.posted, [first, second, third])
+        nonces = [nonce for content, nonce in channel.attempts if content == second]
+        self.assertEqual(nonces, [make_nonce("second#0")] * 2)
+        self.assertEqual(dispatcher.stats["failed"], 1)
+
+    def test_coalesced_page_nonce_comes_from_its_own_messages(self):
+        channel = FakeChannel()
+
+        async def scenario():
+            dispatcher = Dispatcher(lambda channel_id: channel)
+            await asyncio.gather(dispatcher.send(1, "one", key="one"), dispatcher.send(1, "two", key="two"))
+            return dispatcher
+
+        dispatcher = self.run_virtual(scenario())
+        self.assertEqual(channel.attempts, [("one\n\ntwo", make_nonce("one|two#0"))])
+        self.assertEqual(dispatcher.stats["coalesced"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
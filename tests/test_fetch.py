@@ -0,0 +1,133 @@
+import asyncio
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from aiohttp import web
+
+from fetch import Fetcher, FetchError, parse_retry_after
+
+
+class StubServer:
+    """Local HTTP server with one route per behaviour under test."""
+
+    def __init__(self):
+        self.hits: dict[str, int] = {}
+        self.active = 0
+        self.max_active = 0
+        self.runner: web.AppRunner | None = None
+        self.base = ""
+
+    def _hit(self, request: web.Request) -> int:
+        self.hits[request.path] = self.hits.get(request.path, 0) + 1
+        return self.hits[request.path]
+
+    async def slow(self, request: web.Request) -> web.Response:
+        self._hit(request)
+        await asyncio.sleep(1)
+        return web.Response(text="too late")
+
+    async def flaky(self, request: web.Request) -> web.Response:
+        if self._hit(request) <= 2:
+            return web.Response(status=503)
+        return web.Response(text="ok")
+
+    async def busy(self, request: web.Request) -> web.Response:
+        if self._hit(request) == 1:
+            return web.Response(status=429, headers={"Retry-After": "1"})
+        return web.Response(text="ok")
+
+    async def swamped(self, request: web.Request) -> web.Response:
+        if self._hit(request) == 1:
+            return web.Response(status=503, headers={"Retry-After": "86400"})
+        return web.Response(text="ok")
+
+    async def down(self, request: web.Request) -> web.Response:
+        self._hit(request)
+        return web.Response(status=502)
+
+    async def counted(self, request: web.Request) -> web.Response:
+        self._hit(request)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.05)
+        self.active -= 1
+        return web.Response(text="ok")
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/slow", self.slow)
+        app.router.add_get("/flaky", self.flaky)
+        app.router.add_get("/busy", self.busy)
+        app.router.add_get("/swamped", self.swamped)
+        app.router.add_get("/down", self.down)
+        app.router.add_get("/counted/{n}", self.counted)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base = f"http://127.0.0.1:{port}"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+
+class FetcherTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = StubServer()
+        await self.server.start()
+        self.fetcher = Fetcher(read_timeout=0.2, retries=2, backoff=0.01, per_host=2, max_delay=1.5)
+
+    async def asyncTearDown(self):
+        await self.fetcher.close()
+        await self.server.stop()
+
+    async def test_read_timeout_retries_then_raises(self):
+        with self.assertRaises(FetchError):
+            await self.fetcher.get(f"{self.server.base}/slow")
+        self.assertEqual(self.server.hits["/slow"], 3)
+
+    async def test_retries_5xx_until_success(self):
+        result = await self.fetcher.get(f"{self.server.base}/flaky")
+        self.assertEqual((result.status, result.text), (200, "ok"))
+        self.assertEqual(self.server.hits["/flaky"], 3)
+
+    async def test_persistent_5xx_is_returned_after_last_retry(self):
+        result = await self.fetcher.get(f"{self.server.base}/down")
+        self.assertEqual(result.status, 502)
+        self.assertEqual(self.server.hits["/down"], 3)
+
+    async def test_429_waits_for_retry_after(self):
+        started = time.perf_counter()
+        result = await self.fetcher.get(f"{self.server.base}/busy")
+        self.assertEqual(result.status, 200)
+        self.assertEqual(self.server.hits["/busy"], 2)
+        # the jittered backoff alone would be a few hundredths of a second
+        self.assertGreaterEqual(time.perf_counter() - started, 0.9)
+
+    async def test_retry_after_is_capped(self):
+        started = time.perf_counter()
+        result = await self.fetcher.get(f"{self.server.base}/swamped")
+        self.assertEqual(result.status, 200)
+        self.assertLess(time.perf_counter() - started, 3)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("120"), 120.0)
+        soon = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        self.assertAlmostEqual(parse_retry_after(soon), 30, delta=2)
+        past = format_datetime(datetime.now(timezone.utc) - timedelta(hours=1), usegmt=True)
+        self.assertEqual(parse_retry_after(past), 0.0)
+        self.assertIsNone(parse_retry_after("soon"))
+
+    async def test_per_host_limit(self):
+        results = await asyncio.gather(
+            *(self.fetcher.get(f"{self.server.base}/counted/{n}") for n in range(8))
+        )
+        self.assertTrue(all(r.status == 200 for r in results))
+        self.assertEqual(self.server.max_active, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
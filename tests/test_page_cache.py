@@ -0,0 +1,97 @@
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from boxscore import TEAM_NAME
+from fetch import FetchResult
+from page_cache import PageCache
+
+
+class GatedFetcher:
+    """Answers every GET with the same page once `release` is set."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.calls = 0
+
+    async def get(self, url: str, headers: dict | None = None) -> FetchResult:
+        self.calls += 1
+        await self.release.wait()
+        return FetchResult(url, 200, "<html>final</html>", {"ETag": '"1"'})
+
+
+class PageCacheTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "page_cache.sqlite3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_migrates_single_summary_column(self):
+        # the schema from before summaries were kept per team
+        db = sqlite3.connect(self.path)
+        db.execute(
+            """
+            CREATE TABLE pages (
+                url TEXT PRIMARY KEY, html TEXT NOT NULL, etag TEXT, last_modified TEXT,
+                fetched_at REAL NOT NULL, last_access REAL NOT NULL,
+                final INTEGER NOT NULL DEFAULT 0, summary TEXT, size INTEGER NOT NULL
+            )
+            """
+        )
+        db.execute(
+            "INSERT INTO pages VALUES ('/game/1', '<html>', NULL, NULL, 0, 0, 1, ?, 6)",
+            (json.dumps({"status": "Final"}),),
+        )
+        db.execute("INSERT INTO pages VALUES ('/game/2', '<html>', NULL, NULL, 0, 0, 0, NULL, 6)")
+        db.commit()
+        db.close()
+
+        cache = PageCache(self.path)
+        self.addCleanup(cache.close)
+        columns = [c[1] for c in cache.db.execute("PRAGMA table_info(pages)")]
+        self.assertNotIn("summary", columns)
+        page = cache.get("/game/1")
+        self.assertEqual((page.final, page.summary), (True, {"status": "Final"}))
+        self.assertIsNone(cache.get("/game/1", team="Polars").summary)
+        self.assertIsNone(cache.get("/game/2").summary)
+
+        # opening it again leaves it as it is
+        cache.close()
+        reopened = PageCache(self.path)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.get("/game/1").summary, {"status": "Final"})
+
+    async def test_shared_fetch_returns_what_was_stored_meanwhile(self):
+        cache = PageCache(self.path)
+        self.addCleanup(cache.close)
+        fetcher = GatedFetcher()
+
+        async def first():
+            page = await cache.get_page("/game/1", fetcher, team=TEAM_NAME)
+            cache.store_summary(page.url, {"status": "Final"}, True, team=TEAM_NAME)
+            return page
+
+        tasks = [
+            asyncio.create_task(first()),
+            asyncio.create_task(cache.get_page("/game/1", fetcher, team="Polars")),
+        ]
+        await asyncio.sleep(0)
+        fetcher.release.set()
+        ours, theirs = await asyncio.gather(*tasks)
+
+        self.assertEqual(fetcher.calls, 1)
+        self.assertEqual(cache.stats["shared"], 1)
+        self.assertFalse(ours.final)
+        # the other team's page is final now, though it has no summary of its own yet
+        self.assertTrue(theirs.final)
+        self.assertIsNone(theirs.summary)
+        self.assertEqual(theirs.html, "<html>final</html>")
+
+
+if __name__ == "__main__":
+    unittest.main()
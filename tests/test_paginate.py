@@ -0,0 +1,42 @@
+import unittest
+
+from paginate import MESSAGE_LIMIT, paginate, paginate_chunks
+
+
+class PaginateTest(unittest.TestCase):
+    def test_packs_chunks_up_to_the_limit(self):
+        # two chunks plus the separator fill a message exactly
+        half = (MESSAGE_LIMIT - 2) // 2
+        chunks = ["a" * half, "b" * half, "c"]
+        pages = paginate(chunks)
+        self.assertEqual(pages, [f"{'a' * half}\n\n{'b' * half}", "c"])
+        self.assertEqual(len(pages[0]), MESSAGE_LIMIT)
+
+    def test_one_over_the_limit_starts_a_new_page(self):
+        half = (MESSAGE_LIMIT - 2) // 2
+        pages = paginate(["a" * half, "b" * (half + 1)])
+        self.assertEqual(pages, ["a" * half, "b" * (half + 1)])
+
+    def test_long_chunk_is_split_on_lines(self):
+        line = "x" * 150
+        chunk = "\n".join([line] * 30)  # 4529 characters
+        pages = paginate(["intro", chunk])
+        self.assertTrue(all(len(p) <= MESSAGE_LIMIT for p in pages))
+        self.assertEqual(len(pages), 3)
+        self.assertTrue(pages[0].startswith("intro\n\n"))
+        # nothing lost, and no line cut in half
+        self.assertEqual(sum(p.count(line) for p in pages), 30)
+        self.assertEqual("\n".join("\n\n".join(pages).split("\n\n")[1:]), chunk)
+
+    def test_line_longer_than_the_limit_is_hard_cut(self):
+        pages = paginate(["y" * (MESSAGE_LIMIT * 2 + 10)])
+        self.assertEqual([len(p) for p in pages], [MESSAGE_LIMIT, MESSAGE_LIMIT, 10])
+
+    def test_chunks_on_each_page(self):
+        half = (MESSAGE_LIMIT - 2) // 2
+        pages = paginate_chunks(["a" * half, "b" * half, "c" * (MESSAGE_LIMIT + 5), "d"])
+        self.assertEqual([on_page for _, on_page in pages], [[0, 1], [2], [2, 3]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+
+from boxscore import BoxScore
+from clock import LoopClock, VirtualTimeLoop
+from fetch import FetchError
+from postgame import watch_for_final
+
+START = datetime(2025, 11, 7, 21, 30)
+GAME = {"game_link": "/game/1", "opponent": "Polars"}
+
+
+class WatchForFinalTest(unittest.TestCase):
+    def watch(self, pages: list, deadline: timedelta) -> tuple[bool, list[float], list]:
+        """Run the watcher against `pages`, one per poll, repeating the last.
+
+        A page is a BoxScore still in progress, "final", or a FetchError.
+        Returns the result, the seconds after START of each poll and what was posted.
+        """
+        polls, posted = [], []
+
+        async def main():
+            clock = LoopClock(START)
+
+            async def load_box(game, max_age=0):
+                polls.append((clock.now() - START).total_seconds())
+                page = pages[min(len(polls), len(pages)) - 1]
+                if isinstance(page, FetchError):
+                    raise page
+                if page == "final":
+                    return BoxScore(status="Final"), True
+                return page, False
+
+            async def post(game, box):
+                posted.append(box.status)
+
+            return await watch_for_final(GAME, load_box, post, START + deadline, clock=clock)
+
+        result = asyncio.run(main(), loop_factory=VirtualTimeLoop)
+        return result, polls, posted
+
+    def test_unchanged_page_backs_off_to_the_cap(self):
+        _, polls, _ = self.watch([BoxScore(status="3rd")], timedelta(hours=2))
+        gaps = [b - a for a, b in zip(polls, polls[1:])]
+        self.assertEqual(gaps[:7], [120, 180, 270, 405, 607.5, 911.25, 1200])
+        self.assertEqual(gaps[7:-1], [1200] * len(gaps[7:-1]))
+
+    def test_changing_page_keeps_the_first_interval(self):
+        pages = [BoxScore(status="2nd"), BoxScore(status="3rd"), BoxScore(status="3rd"), BoxScore(status="OT")]
+        _, polls, _ = self.watch(pages + ["final"], timedelta(hours=2))
+        self.assertEqual(polls, [0, 120, 240, 420, 540])
+
+    def test_failed_fetch_backs_off(self):
+        pages = [FetchError("503"), FetchError("503"), "final"]
+        result, polls, posted = self.watch(pages, timedelta(hours=2))
+        self.assertTrue(result)
+        self.assertEqual(polls, [0, 180, 450])
+        self.assertEqual(posted, ["Final"])
+
+    def test_final_is_posted_once(self):
+        result, polls, posted = self.watch(["final"], timedelta(hours=2))
+        self.assertTrue(result)
+        self.assertEqual((polls, posted), ([0], ["Final"]))
+
+    def test_gives_up_at_the_deadline(self):
+        result, polls, posted = self.watch([BoxScore(status="3rd")], timedelta(minutes=10))
+        self.assertFalse(result)
+        self.assertEqual(posted, [])
+        # the last sleep is cut short so nothing polls past the deadline
+        self.assertEqual(polls, [0, 120, 300, 570])
+
+
+if __name__ == "__main__":
+    unittest.main()
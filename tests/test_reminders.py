@@ -0,0 +1,141 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from clock import LoopClock, VirtualTimeLoop
+from reminders import ReminderRule, ReminderScheduler, SentLog
+from schedule import BASE_URL, ScheduleStore
+
+START = datetime(2025, 11, 7, 12, 0)
+# One reminder an hour before each game, worth sending until puck drop
+RULES = [ReminderRule("pre_game", lambda start: start - timedelta(hours=1), lambda start: start)]
+
+
+def event(link: str, at: datetime) -> dict:
+    return {
+        "date": at.strftime("%A %b %d %Y"),
+        "time": at.strftime("%-I:%M %p"),
+        "home_or_away": "Home",
+        "location": "Breck",
+        "opponent": "Polars",
+        "opponent_link": "/team/polars/1220",
+        "game_link": link,
+    }
+
+
+class ReminderSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.events_file = os.path.join(self.tmp.name, "events.json")
+        self.sent_log_file = os.path.join(self.tmp.name, "sent_reminders.json")
+        self.writes = 0
+        self.fired: list[tuple[str, datetime]] = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_events(self, events: list[dict]):
+        with open(self.events_file, "w") as f:
+            json.dump(events, f)
+        # a distinct mtime per write, so the store notices even within a second
+        self.writes += 1
+        os.utime(self.events_file, (self.writes, self.writes))
+
+    def run_virtual(self, scenario):
+        async def main():
+            clock = LoopClock(START)
+            scheduler = ReminderScheduler(
+                ScheduleStore(self.events_file),
+                SentLog(self.sent_log_file),
+                {"pre_game": self.handler(clock)},
+                rules=RULES,
+                retry_after=timedelta(minutes=5),
+                clock=clock,
+            )
+            task = asyncio.create_task(scheduler.run())
+            try:
+                await scenario()
+            finally:
+                task.cancel()
+
+        asyncio.run(main(), loop_factory=VirtualTimeLoop)
+
+    def handler(self, clock: LoopClock):
+        async def send(game):
+            self.fired.append((game["game_link"].removeprefix(BASE_URL), clock.now()))
+
+        return send
+
+    def test_moved_game_fires_only_at_its_new_time(self):
+        self.write_events([event("/game/1", START + timedelta(hours=3))])
+
+        async def scenario():
+            await asyncio.sleep(3600)
+            # moved two hours later, the heap entry for the old time is now stale
+            self.write_events([event("/game/1", START + timedelta(hours=5))])
+            await asyncio.sleep(6 * 3600)
+
+        self.run_virtual(scenario)
+        self.assertEqual(self.fired, [("/game/1", START + timedelta(hours=4))])
+
+    def test_cancelled_game_never_fires(self):
+        self.write_events([event("/game/1", START + timedelta(hours=3)), event("/game/2", START + timedelta(hours=4))])
+
+        async def scenario():
+            await asyncio.sleep(3600)
+            self.write_events([event("/game/2", START + timedelta(hours=4))])
+            await asyncio.sleep(6 * 3600)
+
+        self.run_virtual(scenario)
+        self.assertEqual(self.fired, [("/game/2", START + timedelta(hours=3))])
+
+    def test_overdue_reminders_catch_up_until_they_expire(self):
+        # due 30 minutes ago but the game hasn't started, and one that already has
+        self.write_events(
+            [event("/game/1", START + timedelta(minutes=30)), event("/game/2", START - timedelta(minutes=10))]
+        )
+
+        async def scenario():
+            await asyncio.sleep(3 * 3600)
+
+        self.run_virtual(scenario)
+        self.assertEqual(self.fired, [("/game/1", START)])
+
+    def test_failed_handler_is_retried_and_then_never_repeated(self):
+        self.write_events([event("/game/1", START + timedelta(hours=2))])
+        failures = [RuntimeError("Discord is down")]
+        original = self.handler
+
+        def flaky_handler(clock):
+            send = original(clock)
+
+            async def flaky(game):
+                if failures:
+                    raise failures.pop()
+                await send(game)
+
+            return flaky
+
+        self.handler = flaky_handler
+
+        async def scenario():
+            await asyncio.sleep(3 * 3600)
+
+        self.run_virtual(scenario)
+        # due an hour in, retried five minutes after failing
+        self.assertEqual(self.fired, [("/game/1", START + timedelta(hours=1, minutes=5))])
+        with open(self.sent_log_file) as f:
+            self.assertIn(f"{BASE_URL}/game/1:pre_game", json.load(f))
+
+        # a restart with the same sent log doesn't send it again
+        self.handler = original
+        self.fired.clear()
+        self.run_virtual(scenario)
+        self.assertEqual(self.fired, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+
+from schedule import ScheduleStore
+from storage import SqliteGameStore
+
+
+def event(day: str, time: str, opponent: str, home_or_away: str, link: str) -> dict:
+    return {
+        "date": day,
+        "time": time,
+        "home_or_away": home_or_away,
+        "location": "Richfield 1",
+        "opponent": opponent,
+        "opponent_link": f"/team/{opponent.lower().replace(' ', '-')}/1",
+        "game_link": link,
+    }
+
+
+EVENTS = [
+    event("Friday Nov 07 2025", "9:30 PM", "Bold North D2", "Away", "/game/1"),
+    event("Sunday Nov 30 2025", "11:45 PM", "Polars", "Home", "/game/2"),
+    event("Monday Dec 01 2025", "12:15 AM", "Ice Weasels", "Away", "/game/3"),
+    event("Sunday Mar 22 2026", "9:00 PM", "North Stars", "Home", "/game/4"),
+]
+
+
+class FilterTest(unittest.TestCase):
+    """The same filters against both storage backends."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        events_file = os.path.join(self.tmp.name, "events.json")
+        with open(events_file, "w") as f:
+            json.dump(EVENTS, f)
+        db = SqliteGameStore(os.path.join(self.tmp.name, "games.sqlite3"))
+        db.import_events_json(events_file)
+        self.addCleanup(db.close)
+        self.stores = {"json": ScheduleStore(events_file), "sqlite": db}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertFilter(self, expected: list[str], **filters):
+        for name, store in self.stores.items():
+            with self.subTest(store=name, **filters):
+                games = store.filter(**filters)
+                self.assertEqual([g["game_link"].rsplit("/", 1)[1] for g in games], expected)
+
+    def test_no_filters(self):
+        self.assertFilter(["1", "2", "3", "4"])
+
+    def test_date_range_is_inclusive(self):
+        # a game late on the end date counts, one just after midnight doesn't
+        self.assertFilter(["1", "2"], start=date(2025, 11, 7), end=date(2025, 11, 30))
+        self.assertFilter(["3"], start=date(2025, 12, 1), end=date(2025, 12, 1))
+        self.assertFilter([], start=date(2025, 11, 8), end=date(2025, 11, 29))
+
+    def test_far_off_dates(self):
+        self.assertFilter(["1", "2", "3", "4"], start=date(1, 1, 1), end=date(9999, 12, 31))
+        self.assertFilter(["4"], start=date(2026, 1, 1), end=date(9999, 12, 31))
+
+    def test_opponent_is_a_case_insensitive_substring(self):
+        self.assertFilter(["1", "4"], opponent="north")
+        self.assertFilter(["3"], opponent="WEASEL")
+        self.assertFilter([], opponent="Renegades")
+
+    def test_home_or_away(self):
+        self.assertFilter(["2", "4"], home_or_away="home")
+
+    def test_upcoming_only(self):
+        now = datetime(2025, 11, 30, 23, 45)
+        # a game starting right now isn't upcoming any more
+        self.assertFilter(["3", "4"], upcoming_only=True, now=now)
+        self.assertFilter(["3"], upcoming_only=True, now=now, opponent="weasels", end=date(2025, 12, 31))
+
+
+if __name__ == "__main__":
+    unittest.main()
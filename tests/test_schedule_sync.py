@@ -0,0 +1,153 @@
+import json
+import os
+import unittest
+from datetime import datetime
+
+from schedule_sync import diff_schedule, parse_team_schedule
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Another layout: date and time in one cell, "@"/"vs" in the opponent cell,
+# a header row and a row without a game link
+MARKER_LAYOUT = """
+<table>
+  <tr><th>When</th><th>Matchup</th><th>Rink</th><th></th></tr>
+  <tr>
+    <td>Sat, Dec. 6, 2025 9:30 p.m.</td>
+    <td>@ <a href="https://ahahockey.com/team/polars/1220">Polars</a></td>
+    <td>Breck</td>
+    <td><a href="https://ahahockey.com/game/27100?tab=box">Box</a></td>
+  </tr>
+  <tr>
+    <td>Sunday Dec 14 2025 7:05 PM</td>
+    <td>vs <a href="/team/ice-weasels/1049">Ice Weasels</a></td>
+    <td></td>
+    <td><a href="/game/27200">Details</a></td>
+  </tr>
+  <tr><td>Sunday Dec 21 2025</td><td>Holiday break</td></tr>
+  <tr>
+    <td>Sunday Dec 28 2025 7:05 PM</td>
+    <td><a href="/team/dusty-danglers/1101">Dusty Danglers</a></td>
+    <td>Aldrich</td>
+    <td><a href="/game/27300">Details</a></td>
+  </tr>
+</table>
+"""
+
+
+def game(link: str, day: str, time: str = "9:30 PM", **fields) -> dict:
+    return {
+        "date": day,
+        "time": time,
+        "home_or_away": "Home",
+        "location": "Breck",
+        "opponent": "Polars",
+        "opponent_link": "/team/polars/1220",
+        "game_link": link,
+        **fields,
+    }
+
+
+class ParseTeamScheduleTest(unittest.TestCase):
+    def test_fixture_matches_events_json(self):
+        with open(os.path.join(ROOT, "fixtures", "team_schedule.html")) as f:
+            entries = parse_team_schedule(f.read())
+        with open(os.path.join(ROOT, "events.json")) as f:
+            self.assertEqual(entries, json.load(f))
+
+    def test_marker_layout(self):
+        entries = parse_team_schedule(MARKER_LAYOUT)
+        self.assertEqual(
+            entries,
+            [
+                {
+                    "date": "Saturday Dec 06 2025",
+                    "time": "9:30 PM",
+                    "home_or_away": "Away",
+                    "location": "Breck",
+                    "opponent": "Polars",
+                    "opponent_link": "/team/polars/1220",
+                    "game_link": "/game/27100",
+                },
+                {
+                    "date": "Sunday Dec 14 2025",
+                    "time": "7:05 PM",
+                    "home_or_away": "Home",
+                    "location": "",
+                    "opponent": "Ice Weasels",
+                    "opponent_link": "/team/ice-weasels/1049",
+                    "game_link": "/game/27200",
+                },
+            ],
+        )
+
+    def test_page_for_another_team(self):
+        # from the Polars' side the Danglers are the opponent
+        entries = parse_team_schedule(MARKER_LAYOUT, team="Polars")
+        self.assertEqual([e["opponent"] for e in entries], ["Ice Weasels", "Dusty Danglers"])
+
+
+class DiffScheduleTest(unittest.TestCase):
+    now = datetime(2025, 12, 1, 12, 0)
+
+    def test_unchanged(self):
+        old = [game("/game/1", "Sunday Nov 30 2025"), game("/game/2", "Sunday Dec 07 2025")]
+        merged, diff = diff_schedule(old, [dict(g) for g in old], self.now)
+        self.assertEqual(merged, old)
+        self.assertFalse(diff)
+
+    def test_added(self):
+        old = [game("/game/1", "Sunday Dec 07 2025")]
+        new_game = game("/game/2", "Sunday Dec 14 2025", opponent="Ice Weasels")
+        merged, diff = diff_schedule(old, old + [new_game], self.now)
+        self.assertEqual(diff.added, [new_game])
+        self.assertEqual((diff.moved, diff.cancelled), ([], []))
+        self.assertEqual([g["game_link"] for g in merged], ["/game/1", "/game/2"])
+
+    def test_moved(self):
+        before = game("/game/1", "Sunday Dec 07 2025")
+        changes = [{"date": "Monday Dec 08 2025"}, {"time": "10:15 PM"}, {"location": "Aldrich"}, {"home_or_away": "Away"}]
+        for change in changes:
+            with self.subTest(change=change):
+                after = dict(before, **change)
+                merged, diff = diff_schedule([before], [after], self.now)
+                self.assertEqual(diff.moved, [(before, after)])
+                self.assertEqual(merged, [after])
+
+    def test_other_changes_are_not_moves(self):
+        before = game("/game/1", "Sunday Dec 07 2025")
+        after = dict(before, opponent="Polars B")
+        merged, diff = diff_schedule([before], [after], self.now)
+        self.assertFalse(diff)
+        self.assertEqual(merged, [after])
+
+    def test_blank_scraped_fields_keep_hand_edits(self):
+        before = game("/game/1", "Sunday Dec 07 2025", location="Breck North")
+        merged, diff = diff_schedule([before], [dict(before, location="")], self.now)
+        self.assertFalse(diff)
+        self.assertEqual(merged, [before])
+
+    def test_upcoming_game_gone_from_page_is_cancelled(self):
+        kept = game("/game/1", "Sunday Dec 07 2025")
+        gone = game("/game/2", "Sunday Dec 14 2025")
+        merged, diff = diff_schedule([kept, gone], [kept], self.now)
+        self.assertEqual(diff.cancelled, [gone])
+        self.assertEqual(merged, [kept])
+
+    def test_past_game_gone_from_page_is_kept(self):
+        past = game("/game/1", "Sunday Nov 30 2025")
+        upcoming = game("/game/2", "Sunday Dec 07 2025")
+        merged, diff = diff_schedule([past, upcoming], [upcoming], self.now)
+        self.assertFalse(diff)
+        self.assertEqual(merged, [past, upcoming])
+
+    def test_merged_is_sorted_by_date(self):
+        old = [game("/game/3", "Sunday Dec 21 2025")]
+        new = [game("/game/3", "Sunday Dec 21 2025"), game("/game/1", "Sunday Dec 07 2025", time="7:00 PM")]
+        merged, diff = diff_schedule(old, new, self.now)
+        self.assertEqual([g["game_link"] for g in merged], ["/game/1", "/game/3"])
+        self.assertEqual([g["game_link"] for g in diff.added], ["/game/1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
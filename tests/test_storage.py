@@ -0,0 +1,144 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+
+from boxscore import BoxScore
+from schedule import BASE_URL
+from stats import SeasonStats
+from storage import SqliteGameStore
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+
+EVENTS = [
+    {
+        "date": "Friday Nov 07 2025",
+        "time": "9:30 PM",
+        "home_or_away": "Away",
+        "location": "Richfield 1",
+        "opponent": "Polars",
+        "opponent_link": "/team/polars/1001",
+        "game_link": "/game/27009",
+    },
+    {
+        "date": "Sunday Dec 14 2025",
+        "time": "8:00 PM",
+        "home_or_away": "Home",
+        "location": "Richfield 2",
+        "opponent": "Renegades",
+        "opponent_link": "/team/renegades/1002",
+        "game_link": "/game/26906",
+    },
+    {
+        "date": "Sunday Mar 22 2026",
+        "time": "9:00 PM",
+        "home_or_away": "Away",
+        "location": "Richfield 1",
+        "opponent": "Polars",
+        "opponent_link": "/team/polars/1001",
+        "game_link": "/game/28105",
+    },
+]
+
+
+def load_box(name: str) -> BoxScore:
+    with open(os.path.join(FIXTURES, f"{name}.expected.json")) as f:
+        return BoxScore.from_dict(json.load(f))
+
+
+class SqliteGameStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.events_file = os.path.join(self.tmp.name, "events.json")
+        self.write_events(EVENTS)
+        self.store = SqliteGameStore(os.path.join(self.tmp.name, "games.sqlite3"))
+        self.boxes = {"/game/27009": load_box("game_27009"), "/game/26906": load_box("game_26906")}
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def write_events(self, events: list[dict]):
+        with open(self.events_file, "w") as f:
+            json.dump(events, f)
+
+    def record_results(self):
+        for game in self.store.games():
+            box = self.boxes.get(game["game_link"].removeprefix(BASE_URL))
+            if box:
+                self.store.record_box_score(game, box)
+
+    def test_import_events_json(self):
+        self.assertTrue(self.store.is_empty())
+        self.assertEqual(self.store.import_events_json(self.events_file), 3)
+        games = self.store.games()
+        self.assertEqual([g["opponent"] for g in games], ["Polars", "Renegades", "Polars"])
+        self.assertEqual(games[0]["datetime"], datetime(2025, 11, 7, 21, 30))
+
+        # games dropped from the file go, results of the ones kept stay
+        self.record_results()
+        self.write_events(EVENTS[:2])
+        self.assertEqual(self.store.import_events_json(self.events_file), 2)
+        self.assertEqual(len(self.store.games()), 2)
+        self.assertEqual(self.store.record()["games"], 2)
+
+    def test_import_sent_log(self):
+        sent_log = os.path.join(self.tmp.name, "sent_reminders.json")
+        with open(sent_log, "w") as f:
+            json.dump({"/game/27009:rsvp": "2025-11-04T10:00:00"}, f)
+        self.store.import_sent_log(sent_log)
+        self.assertIn("/game/27009:rsvp", self.store)
+        self.assertNotIn("/game/27009:game_day", self.store)
+
+    def test_record_box_score_matches_season_stats(self):
+        self.store.import_events_json(self.events_file)
+        self.record_results()
+        # recording a game again replaces it rather than counting it twice
+        self.record_results()
+
+        stats = SeasonStats(os.path.join(self.tmp.name, "season_stats.json"))
+        for game in self.store.games():
+            box = self.boxes.get(game["game_link"].removeprefix(BASE_URL))
+            if box:
+                stats.fold(game, box)
+
+        self.assertEqual(self.store.record(), stats.record())
+        for stat in ("points", "goals", "assists"):
+            # players tied on a stat may come in either order
+            leaders = self.store.leaderboard(stat)
+            self.assertCountEqual(leaders, stats.leaderboard(stat))
+            self.assertEqual([s[stat] for _, s in leaders], [s[stat] for _, s in stats.leaderboard(stat)])
+        self.assertEqual(self.store.goalie_lines(), stats.goalie_lines())
+
+    def test_games_vs(self):
+        self.store.import_events_json(self.events_file)
+        self.record_results()
+        games = self.store.games_vs("polars")
+        self.assertEqual([g["game_link"] for g in games], ["/game/27009", "/game/28105"])
+        self.assertEqual((games[0]["goals_for"], games[0]["goals_against"], games[0]["result"]), (5, 3, "W"))
+        self.assertEqual(games[0]["datetime"], datetime(2025, 11, 7, 21, 30))
+        # not played yet
+        self.assertIsNone(games[1]["result"])
+
+    def test_player_points(self):
+        self.store.import_events_json(self.events_file)
+        self.record_results()
+        season = {"goals": 0, "assists": 0}
+        for game in self.store.games():
+            box = self.boxes.get(game["game_link"].removeprefix(BASE_URL))
+            for g in box.goals if box else []:
+                season["goals"] += g.scorer == "#12 S. Johnson"
+                season["assists"] += "#12 S. Johnson" in (g.assist1, g.assist2)
+        season["points"] = season["goals"] + season["assists"]
+
+        self.assertEqual(self.store.player_points("#12 S. Johnson"), season)
+        november = self.store.player_points("#12 S. Johnson", date(2025, 11, 1), date(2025, 11, 7))
+        self.assertGreater(november["points"], 0)
+        # both dates are inclusive, and far-off dates don't overflow
+        self.assertEqual(self.store.player_points("#12 S. Johnson", date(2025, 11, 7), date(9999, 12, 31)), season)
+        self.assertEqual(self.store.player_points("#12 S. Johnson", end=date(2025, 11, 6))["points"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
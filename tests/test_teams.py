@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import unittest
+
+from teams import TEAMS_DIR, Team, TeamConfig, find_team, load_team_configs, shard_for
+
+DEFAULT = TeamConfig(key="dusty-danglers", name="Dusty Danglers", channel_id=1, events_file="./events.json")
+
+
+def team(key: str, guild_id: int | None, channel_id: int) -> Team:
+    config = TeamConfig(key=key, name=key.title(), channel_id=channel_id, guild_id=guild_id)
+    return Team(config=config, schedule=None, season_stats=None, sent_log=None)
+
+
+class LoadTeamConfigsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "teams.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, entries: list[dict]):
+        with open(self.path, "w") as f:
+            json.dump(entries, f)
+
+    def test_without_file_uses_default(self):
+        self.assertEqual(load_team_configs(self.path, DEFAULT), [DEFAULT])
+
+    def test_entries(self):
+        self.write(
+            [
+                {"name": "Ice Weasels", "channel_id": "222", "guild_id": "333"},
+                {"key": "polars-b", "name": "Polars", "channel_id": 444, "events_file": "./polars.json"},
+            ]
+        )
+        weasels, polars = load_team_configs(self.path, DEFAULT)
+        self.assertEqual(weasels.key, "ice-weasels")
+        # quoted snowflakes are turned into ints
+        self.assertEqual((weasels.channel_id, weasels.guild_id), (222, 333))
+        self.assertEqual(weasels.events_file, os.path.join(TEAMS_DIR, "ice-weasels", "events.json"))
+        self.assertEqual(polars.key, "polars-b")
+        self.assertIsNone(polars.guild_id)
+        self.assertEqual(polars.events_file, "./polars.json")
+        self.assertEqual(polars.stats_file, os.path.join(TEAMS_DIR, "polars-b", "season_stats.json"))
+
+    def test_unknown_setting(self):
+        self.write([{"name": "Ice Weasels", "channel_id": 222, "chanel": 1}])
+        with self.assertRaisesRegex(ValueError, "unknown team settings.*chanel"):
+            load_team_configs(self.path, DEFAULT)
+
+    def test_duplicate_keys(self):
+        # different names that slug to the same key
+        self.write([{"name": "Ice Weasels", "channel_id": 1}, {"name": "Ice-Weasels!", "channel_id": 2}])
+        with self.assertRaisesRegex(ValueError, "duplicate team keys.*ice-weasels"):
+            load_team_configs(self.path, DEFAULT)
+
+
+class RoutingTest(unittest.TestCase):
+    def setUp(self):
+        self.weasels = team("weasels", guild_id=100, channel_id=1)
+        self.weasels_b = team("weasels-b", guild_id=100, channel_id=2)
+        self.polars = team("polars", guild_id=200, channel_id=3)
+        self.fallback = team("danglers", guild_id=None, channel_id=4)
+        self.teams = [self.weasels, self.weasels_b, self.polars, self.fallback]
+
+    def test_server_team(self):
+        self.assertIs(find_team(self.teams, 200, 99), self.polars)
+
+    def test_channel_picks_between_teams_of_one_server(self):
+        self.assertIs(find_team(self.teams, 100, 2), self.weasels_b)
+        # any other channel on that server gets its first team
+        self.assertIs(find_team(self.teams, 100, 99), self.weasels)
+
+    def test_other_servers_and_dms_get_the_team_without_a_server(self):
+        self.assertIs(find_team(self.teams, 300, 5), self.fallback)
+        self.assertIs(find_team(self.teams, None, 5), self.fallback)
+
+    def test_no_team(self):
+        self.assertIsNone(find_team([self.weasels, self.polars], 300, 5))
+
+    def test_shard_for(self):
+        guild_id = 81384788765712384
+        self.assertEqual(shard_for(self.fallback.config, 4), 0)
+        self.assertEqual(shard_for(team("x", guild_id, 1).config, None), 0)
+        self.assertEqual(shard_for(team("x", guild_id, 1).config, 4), (guild_id >> 22) % 4)
+
+
+if __name__ == "__main__":
+    unittest.main()